@@ -8,6 +8,8 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "name": "llava-hf/llava-1.5-7b-hf",
         "device": "auto",  # auto, cpu, cuda
         "quantization": "auto",  # auto, none, 4bit, 8bit
+        "kv_cache_bits": None,  # None, 2, 4 (quantized KV cache; needs optimum-quanto or hqq)
+        "compile": False,  # torch.compile + static KV cache (CUDA, torch >= 2.3)
     },
     "inference": {
         "temperature": 0.2,
@@ -23,6 +25,7 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "recursive": False,
         "skip_errors": True,
         "clear_cache_interval": 10,
+        "batch_size": 4,  # Images per generate() call
         "resize_before_inference": True,
         "max_dimension": 1024,
         "resize_method": "lanczos",
@@ -9,7 +9,7 @@ from PySide6.QtGui import QFont
 from pathlib import Path
 import logging
 
-from models.downloader import ModelDownloader
+from imagecaptioner.models.downloader import ModelDownloader
 
 logger = logging.getLogger(__name__)
 
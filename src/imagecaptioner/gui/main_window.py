@@ -8,6 +8,7 @@ from PySide6.QtCore import Qt, QUrl
 from PySide6.QtGui import QDesktopServices
 from pathlib import Path
 from datetime import datetime
+from typing import Optional, Dict, Any, TYPE_CHECKING
 import logging
 
 from .panels.input_panel import InputPanel
@@ -18,8 +19,11 @@ from .panels.model_status_panel import ModelStatusPanel
 from .workers.inference_worker import InferenceWorker
 from .workers.model_checker_worker import ModelCheckerWorker
 from .dialogs.download_dialog import show_download_dialog_if_needed
-from config.app_config import get_config, save_config
-from processing.export import CaptionExporter
+from imagecaptioner.config.app_config import get_config, save_config
+from imagecaptioner.processing.export import CaptionExporter
+
+if TYPE_CHECKING:
+    from imagecaptioner.models.llava import LLaVAModel
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +44,11 @@ class MainWindow(QMainWindow):
         self.processing_results = None
         self.app_config = get_config()
         
+        # Loaded model shared across runs (weights take 10-30s to load)
+        self._llava_model: Optional["LLaVAModel"] = None
+        self._llava_model_config: Optional[Dict[str, Any]] = None
+        self._requested_model_config: Optional[Dict[str, Any]] = None
+        
         self.setup_ui()
         self.connect_signals()
         self.setup_keyboard_shortcuts()
@@ -181,6 +190,7 @@ class MainWindow(QMainWindow):
         
         # Model status panel signals
         self.model_status_panel.download_requested.connect(self.on_download_requested)
+        self.model_status_panel.unload_requested.connect(self.unload_model)
     
     def on_directory_selected(self, directory):
         """Handle directory selection."""
@@ -325,8 +335,8 @@ class MainWindow(QMainWindow):
             )
             return
         
-        # Get configuration
-        model_config = config.get("model", {})
+        # Get configuration (advanced model settings like kv_cache_bits only live in the config file)
+        model_config = {**self.app_config.get("model", {}), **config.get("model", {})}
         inference_config = config.get("inference", {})
         processing_config = config.get("processing", {})
         prompt = self.prompt_panel.get_prompt()
@@ -349,6 +359,7 @@ class MainWindow(QMainWindow):
         self.is_processing = True
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
+        self.model_status_panel.set_model_loaded(False)
         self.input_panel.setEnabled(False)
         self.config_panel.setEnabled(False)
         self.prompt_panel.setEnabled(False)
@@ -360,6 +371,10 @@ class MainWindow(QMainWindow):
         # Get trigger word from prompt panel
         trigger_word = self.prompt_panel.get_trigger_word()
         
+        # Reuse the resident model when the model settings haven't changed
+        self._requested_model_config = dict(model_config)
+        model = self.get_or_load_model(model_config)
+        
         # Create worker thread with full config
         self.inference_worker = InferenceWorker(
             directory=self.selected_directory,
@@ -367,7 +382,8 @@ class MainWindow(QMainWindow):
             inference_config=inference_config,
             prompt=prompt,
             trigger_word=trigger_word,
-            processing_config=processing_config
+            processing_config=processing_config,
+            model=model
         )
         
         # Pass export directory to worker for resize caching
@@ -378,6 +394,7 @@ class MainWindow(QMainWindow):
         self.inference_worker.caption_generated.connect(self.on_caption_generated)
         self.inference_worker.error_occurred.connect(self.on_error_occurred)
         self.inference_worker.status_message.connect(self.on_status_message)
+        self.inference_worker.model_loaded.connect(self.on_model_loaded)
         self.inference_worker.finished.connect(self.on_processing_finished)
         
         # Start processing
@@ -415,6 +432,55 @@ class MainWindow(QMainWindow):
                                          generation_time=generation_time, file_size=file_size,
                                          dimensions=dimensions, img_type=img_type)
     
+    def on_model_loaded(self, model):
+        """Keep the model loaded by the worker resident for later runs."""
+        self._llava_model = model
+        self._llava_model_config = self._requested_model_config
+        logger.info("Model kept loaded for subsequent runs")
+    
+    def get_or_load_model(self, model_config: Dict[str, Any]) -> Optional["LLaVAModel"]:
+        """
+        Get the resident model if it matches the requested model settings.
+        
+        A model loaded with different settings is unloaded first. Loading itself
+        happens in the inference worker so the GUI thread never blocks on it.
+        
+        Args:
+            model_config: Model configuration (device, quantization)
+            
+        Returns:
+            The loaded model, or None if the worker needs to load one
+        """
+        if self._llava_model is None:
+            return None
+        
+        if self._llava_model_config == model_config and self._llava_model.is_loaded():
+            logger.info("Reusing loaded model")
+            return self._llava_model
+        
+        logger.info("Model settings changed, unloading previous model")
+        self.unload_model()
+        return None
+    
+    def unload_model(self):
+        """Unload the resident model to free memory."""
+        if self._llava_model is None:
+            return
+        if self.inference_worker is not None and self.inference_worker.isRunning():
+            logger.warning("Cannot unload model while processing")
+            return
+        
+        try:
+            self._llava_model.unload()
+        except Exception as e:
+            logger.error(f"Error unloading model: {e}")
+        
+        self._llava_model = None
+        self._llava_model_config = None
+        self.model_status_panel.set_model_loaded(False)
+        self.statusBar().showMessage("Model unloaded")
+        logger.info("Resident model unloaded")
+    
     def on_error_occurred(self, image_name: str, error_message: str):
         """Handle processing errors."""
         self.output_panel.add_caption_log(image_name, error_message, is_error=True)
@@ -431,6 +497,7 @@ class MainWindow(QMainWindow):
         # Update UI state
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
+        self.model_status_panel.set_model_loaded(self._llava_model is not None)
         self.input_panel.setEnabled(True)
         self.config_panel.setEnabled(True)
         self.prompt_panel.setEnabled(True)
@@ -618,6 +685,7 @@ class MainWindow(QMainWindow):
             else:
                 event.ignore()
         else:
+            self.unload_model()
             event.accept()
     
     def check_model_status(self):
@@ -658,7 +726,7 @@ class MainWindow(QMainWindow):
     
     def on_download_requested(self):
         """Handle download/verify button click from status panel."""
-        from models.downloader import ModelDownloader
+        from imagecaptioner.models.downloader import ModelDownloader
         
         downloader = ModelDownloader("llava-hf/llava-1.5-7b-hf")
         is_cached = downloader.is_model_cached()
@@ -8,8 +8,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 import logging
 
-from config.defaults import DEFAULT_CONFIG
-from utils.validators import (
+from imagecaptioner.config.defaults import DEFAULT_CONFIG
+from imagecaptioner.utils.validators import (
     validate_temperature,
     validate_max_tokens,
     validate_top_p,
@@ -128,6 +128,17 @@ class ConfigPanel(QWidget):
         self.rep_penalty_spin.setToolTip("Penalty for repeating tokens (1.0=none, higher=more penalty)")
         inference_layout.addRow("Repetition Penalty:", self.rep_penalty_spin)
         
+        # Batch size
+        self.batch_size_spin = QSpinBox()
+        self.batch_size_spin.setRange(1, 16)
+        self.batch_size_spin.setValue(DEFAULT_CONFIG["processing"]["batch_size"])
+        self.batch_size_spin.valueChanged.connect(self.on_config_changed)
+        self.batch_size_spin.setToolTip(
+            "Images captioned per model call.\n"
+            "Higher is faster on GPU but needs more VRAM; use 1 if you run out of memory."
+        )
+        inference_layout.addRow("Batch Size:", self.batch_size_spin)
+        
         inference_group.setLayout(inference_layout)
         layout.addWidget(inference_group)
         
@@ -267,6 +278,7 @@ class ConfigPanel(QWidget):
                 "cache_resized_images": self.cache_resized_checkbox.isChecked(),
                 "cache_format": ["original", "png", "jpeg"][self.cache_format_combo.currentIndex()],
                 "jpeg_quality": 95,
+                "batch_size": self.batch_size_spin.value(),
             },
             "export": {
                 "formats": formats,
@@ -323,7 +335,10 @@ class ConfigPanel(QWidget):
         processing_config = config.get("processing", {})
         self.resize_enable_checkbox.setChecked(processing_config.get("resize_before_inference", True))
         self.max_dimension_spin.setValue(processing_config.get("max_dimension", 1024))
-        self.cache_resized_checkbox.setChecked(processing_config.get("cache_resized_images", False))        
+        self.cache_resized_checkbox.setChecked(processing_config.get("cache_resized_images", False))
+        self.batch_size_spin.setValue(
+            processing_config.get("batch_size", DEFAULT_CONFIG["processing"]["batch_size"])
+        )
         # Cache format
         cache_format = processing_config.get("cache_format", "original")
         format_index = {"original": 0, "png": 1, "jpeg": 2}.get(cache_format, 0)
@@ -8,7 +8,7 @@ from PySide6.QtCore import Signal
 from pathlib import Path
 import logging
 
-from utils.validators import validate_directory, SUPPORTED_FORMATS
+from imagecaptioner.utils.validators import validate_directory, has_supported_extension, SUPPORTED_FORMATS
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +111,7 @@ class InputPanel(QWidget):
         count = 0
         try:
             for item in dir_path.iterdir():
-                if item.is_file() and item.suffix.lower() in SUPPORTED_FORMATS:
+                if has_supported_extension(item.name) and item.is_file():
                     count += 1
         except Exception as e:
             logger.error(f"Error counting images: {e}")
@@ -14,6 +14,7 @@ class ModelStatusPanel(QWidget):
     """Panel displaying model cache status and download options."""
     
     download_requested = Signal()  # Emitted when user wants to download/verify
+    unload_requested = Signal()  # Emitted when user wants to free the loaded model
     status_changed = Signal(bool)  # Emitted when status changes (is_cached)
     
     def __init__(self, parent=None):
@@ -55,6 +56,16 @@ class ModelStatusPanel(QWidget):
         self.action_btn.clicked.connect(self.on_action_clicked)
         layout.addWidget(self.action_btn)
         
+        # Unload button (only meaningful once a run has loaded the model)
+        self.unload_btn = QPushButton("Unload Model")
+        self.unload_btn.setEnabled(False)
+        self.unload_btn.setToolTip(
+            "Free the GPU/CPU memory held by the loaded model.\n"
+            "The model stays loaded between runs until unloaded or the app exits."
+        )
+        self.unload_btn.clicked.connect(self.unload_requested.emit)
+        layout.addWidget(self.unload_btn)
+        
         # Set panel background
         self.setStyleSheet(
             "QWidget { "
@@ -149,6 +160,10 @@ class ModelStatusPanel(QWidget):
         self.status_changed.emit(False)
         logger.error(f"Status: Error - {error_msg}")
     
+    def set_model_loaded(self, loaded: bool):
+        """Enable the unload button while a model is resident in memory."""
+        self.unload_btn.setEnabled(loaded)
+    
     def on_action_clicked(self):
         """Handle action button click."""
         logger.info("Download/verify action requested")
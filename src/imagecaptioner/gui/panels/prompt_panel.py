@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal
 import logging
 
-from config.prompts import get_preset_prompts, get_default_prompt
+from imagecaptioner.config.prompts import get_preset_prompts, get_default_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,378 @@
+"""Worker thread for batch image processing."""
+
+from PySide6.QtCore import QThread, Signal
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from PIL import Image
+import logging
+import time
+
+from imagecaptioner.config.defaults import DEFAULT_CONFIG
+from imagecaptioner.models.downloader import ModelDownloader
+from imagecaptioner.processing.batch_processor import BatchProcessor
+
+if TYPE_CHECKING:
+    from imagecaptioner.models.llava import LLaVAModel
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceWorker(QThread):
+    """Background worker for processing images with LLaVA model."""
+    
+    # Signals
+    progress_updated = Signal(int, int, str)  # current, total, image_name
+    caption_generated = Signal(str, str, float, int, str, str)  # image_name, caption, gen_time, file_size, dimensions, img_type
+    error_occurred = Signal(str, str)  # image_name, error_message
+    status_message = Signal(str)  # status message
+    model_loaded = Signal(object)  # LLaVAModel loaded by this worker
+    finished = Signal(bool, dict)  # success, summary
+    
+    def __init__(
+        self,
+        directory: Path,
+        model_config: Dict[str, Any],
+        inference_config: Dict[str, Any],
+        prompt: str,
+        trigger_word: str = "",
+        processing_config: Dict[str, Any] = None,
+        model: Optional["LLaVAModel"] = None,
+        parent=None
+    ):
+        """
+        Initialize inference worker.
+        
+        Args:
+            directory: Directory containing images
+            model_config: Model configuration dictionary
+            inference_config: Inference parameters dictionary
+            prompt: Prompt text for caption generation
+            trigger_word: Optional trigger word/prefix to prepend to captions
+            processing_config: Processing configuration (resize settings)
+            model: Already-loaded model to reuse. If None, the worker loads one
+                and hands it over via model_loaded.
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        
+        self.directory = directory
+        self.model_config = model_config
+        self.inference_config = inference_config
+        self.prompt = prompt
+        self.trigger_word = trigger_word
+        self.processing_config = processing_config or {}
+        self.export_dir = None  # Set by caller for resize caching
+        
+        self.batch_processor = BatchProcessor(skip_errors=True)
+        self.model = model
+        self._owns_model = False
+        self._is_cancelled = False
+        self._cache_clear_interval = 10
+    
+    def run(self):
+        """
+        Run the batch processing in background thread.
+        """
+        try:
+            logger.info("=== Inference Worker Starting ===")
+            logger.info(f"Model config: {self.model_config}")
+            logger.info(f"Inference config: {self.inference_config}")
+            logger.info(f"Directory: {self.directory}")
+            
+            # Check if model is cached
+            logger.info("Checking model cache...")
+            self.status_message.emit("Checking model availability...")
+            downloader = ModelDownloader()
+            
+            if not downloader.is_model_cached():
+                self.status_message.emit("Model not cached. Please download first.")
+                self.finished.emit(False, {"error": "Model not cached"})
+                return
+            
+            # Prepare batch
+            self.status_message.emit("Scanning directory for images...")
+            image_paths = self.batch_processor.prepare_batch(
+                self.directory,
+                recursive=False
+            )
+            
+            if not image_paths:
+                self.status_message.emit("No valid images found")
+                self.finished.emit(False, {"error": "No valid images"})
+                return
+            
+            total_images = len(image_paths)
+            logger.info(f"Starting batch processing of {total_images} images")
+            
+            # Load model, or reuse the one kept resident by the main window
+            if self.model is not None and self.model.is_loaded():
+                logger.info("Reusing loaded model")
+                self.status_message.emit("Using already loaded model")
+            else:
+                self._owns_model = True
+                if not self._load_model():
+                    return
+                # Hand the weights to the caller so they outlive this run
+                self._owns_model = False
+                self.model_loaded.emit(self.model)
+            
+            # Process images in micro-batches (one generate() call per batch)
+            batch_size = self.processing_config.get("batch_size", DEFAULT_CONFIG["processing"]["batch_size"])
+            logger.info(f"Batch size: {batch_size}")
+            done = 0
+            since_cache_clear = 0
+            
+            # Images for the next batch are decoded while the current one generates
+            outcomes = self.batch_processor.process_with_model(
+                self.model,
+                image_paths,
+                self.prompt,
+                batch_size=batch_size,
+                processing_config=self.processing_config,
+                export_dir=self.export_dir,
+                **self.inference_config
+            )
+            
+            for outcome in outcomes:
+                for image_path in outcome["paths"]:
+                    done += 1
+                    self.progress_updated.emit(done, total_images, image_path.name)
+                
+                for image_path, error in outcome["failures"]:
+                    self._handle_error(image_path, error)
+                
+                batch_items = outcome["items"]
+                if outcome["error"] is None and outcome["captions"] is not None:
+                    self._emit_captions(
+                        batch_items,
+                        outcome["captions"],
+                        outcome["generation_time"] / len(batch_items)
+                    )
+                elif batch_items:
+                    self._retry_individually(batch_items, outcome["error"])
+                
+                # Clear CUDA cache periodically
+                since_cache_clear += len(outcome["paths"])
+                if since_cache_clear >= self._cache_clear_interval:
+                    since_cache_clear = 0
+                    if self.model:
+                        self.model.clear_cache()
+                        logger.debug("Cleared CUDA cache")
+                
+                if self._is_cancelled:
+                    logger.info("Processing cancelled by user")
+                    break
+            outcomes.close()
+            
+            # Cleanup (the model itself stays loaded for the next run)
+            self.status_message.emit("Cleaning up...")
+            if self.model:
+                self.model.clear_cache()
+            
+            # Get summary
+            summary = self.batch_processor.get_summary()
+            summary["results"] = self.batch_processor.get_results()
+            summary["errors"] = self.batch_processor.get_errors()
+            summary["cancelled"] = self._is_cancelled
+            
+            success = not self._is_cancelled and summary["total_errors"] < total_images
+            
+            logger.info(
+                f"Batch processing finished: "
+                f"{summary['total_processed']} processed, "
+                f"{summary['total_errors']} errors"
+            )
+            
+            self.finished.emit(success, summary)
+            
+        except Exception as e:
+            error_msg = f"Unexpected error during processing: {str(e)}"
+            logger.exception(error_msg)
+            self.status_message.emit(error_msg)
+            self.finished.emit(False, {"error": error_msg})
+        
+        finally:
+            # Only unload a model that never made it back to the caller
+            if self.model and self._owns_model:
+                try:
+                    self.model.unload()
+                except Exception as e:
+                    logger.error(f"Error during cleanup: {e}")
+    
+    def _retry_individually(self, batch_items: List[Tuple[Path, Image.Image, Dict[str, Any]]], error: Exception):
+        """
+        Caption the images of a failed batch one at a time.
+        
+        A single bad image or an out-of-memory batch then only costs the
+        images that actually fail, not the whole batch.
+        
+        Args:
+            batch_items: List of (image_path, processed_image, metadata) tuples
+            error: Exception raised for the batch as a whole
+        """
+        if len(batch_items) == 1:
+            self._handle_error(batch_items[0][0], error)
+            return
+        
+        logger.warning(f"Batch generation failed, retrying images individually: {error}")
+        self.model.clear_cache()
+        for image_path, image, metadata in batch_items:
+            if self._is_cancelled:
+                break
+            
+            start_time = time.time()
+            try:
+                captions = self.model.generate_captions_batch(
+                    [(str(image_path), image)],
+                    prompt=self.prompt,
+                    **self.inference_config
+                )
+            except Exception as e:
+                self._handle_error(image_path, e)
+                continue
+            
+            self._emit_captions([(image_path, image, metadata)], captions, time.time() - start_time)
+    
+    def _emit_captions(
+        self,
+        batch_items: List[Tuple[Path, Image.Image, Dict[str, Any]]],
+        captions: List[str],
+        generation_time: float
+    ):
+        """
+        Store generated captions and emit them to the GUI.
+        
+        Args:
+            batch_items: List of (image_path, processed_image, metadata) tuples
+            captions: Captions in the same order as batch_items
+            generation_time: Per-image generation time for display
+        """
+        for (image_path, _, metadata), caption in zip(batch_items, captions):
+            # Apply trigger word/prefix if provided (validate non-empty)
+            if self.trigger_word:
+                caption = f"{self.trigger_word}{caption}"
+            
+            # Store result
+            self.batch_processor.add_result(image_path, caption)
+            
+            # Emit signal with full metadata
+            self.caption_generated.emit(
+                image_path.name,
+                caption,
+                generation_time,
+                metadata["file_size"],
+                metadata["dimensions"],
+                metadata["img_format"]
+            )
+            
+            logger.debug(f"Generated caption for {image_path.name}")
+    
+    def _handle_error(self, image_path: Path, error: Exception):
+        """Record a per-image failure and notify the GUI."""
+        error_msg = str(error)
+        logger.error(f"Error processing {image_path.name}: {error_msg}")
+        
+        # Store error
+        self.batch_processor.add_error(image_path, error_msg)
+        
+        # Emit error signal
+        self.error_occurred.emit(image_path.name, error_msg)
+    
+    def _load_model(self) -> bool:
+        """
+        Construct and load the LLaVA model, falling back to lighter settings on OOM.
+        
+        Emits finished(False, ...) itself when loading fails.
+        
+        Returns:
+            True if the model is loaded and ready for inference
+        """
+        from imagecaptioner.models.llava import LLaVAModel
+        
+        logger.info("Initializing LLaVA model...")
+        logger.info(f"Device: {self.model_config.get('device', 'auto')}, Quantization: {self.model_config.get('quantization', 'auto')}")
+        self.status_message.emit("Loading model...")
+        self.model = LLaVAModel(
+            device=self.model_config.get("device", "auto"),
+            quantization=self.model_config.get("quantization", "auto"),
+            kv_cache_bits=self.model_config.get("kv_cache_bits"),
+            compile_model=self.model_config.get("compile", False)
+        )
+        
+        try:
+            logger.info("Calling model.load()... (this may take 10-30 seconds)")
+            self.model.load()
+            self.status_message.emit("Model loaded successfully")
+            model_info = self.model.get_model_info()
+            logger.info(f"Model loaded successfully: {model_info}")
+            logger.info("=== Model Ready for Inference ===")
+        except RuntimeError as e:
+            # Handle CUDA out-of-memory errors with automatic fallback
+            if "out of memory" in str(e).lower() or "cuda out of memory" in str(e).lower():
+                current_quant = self.model_config.get("quantization", "auto")
+                
+                if current_quant in ["8bit", "auto"]:
+                    # Fallback to 4-bit quantization
+                    logger.warning("CUDA OOM detected, retrying with 4-bit quantization...")
+                    self.status_message.emit("GPU memory full - switching to 4-bit mode...")
+                    self.model_config["quantization"] = "4bit"
+                    self.model = LLaVAModel(
+                        device=self.model_config.get("device", "auto"),
+                        quantization="4bit",
+                        kv_cache_bits=self.model_config.get("kv_cache_bits"),
+                        compile_model=self.model_config.get("compile", False)
+                    )
+                    try:
+                        self.model.load()
+                        self.status_message.emit("Model loaded in 4-bit mode")
+                        logger.info("Successfully loaded model with 4-bit quantization")
+                    except Exception as e2:
+                        error_msg = f"Failed to load model even with 4-bit: {str(e2)}"
+                        logger.error(error_msg)
+                        self.status_message.emit(error_msg)
+                        self.finished.emit(False, {"error": error_msg})
+                        return False
+                elif current_quant == "4bit":
+                    # Fallback to CPU mode
+                    logger.warning("4-bit OOM detected, falling back to CPU (slow)...")
+                    self.status_message.emit("Switching to CPU mode (processing will be slower)...")
+                    self.model_config["device"] = "cpu"
+                    self.model_config["quantization"] = "none"
+                    self.model = LLaVAModel(device="cpu", quantization="none")
+                    try:
+                        self.model.load()
+                        self.status_message.emit("Model loaded in CPU mode (slower)")
+                        logger.info("Successfully loaded model on CPU")
+                    except Exception as e2:
+                        error_msg = f"Failed to load model on CPU: {str(e2)}"
+                        logger.error(error_msg)
+                        self.status_message.emit(error_msg)
+                        self.finished.emit(False, {"error": error_msg})
+                        return False
+                else:
+                    # Already on optimal settings, re-raise
+                    error_msg = f"Failed to load model: {str(e)}"
+                    logger.error(error_msg)
+                    self.status_message.emit(error_msg)
+                    self.finished.emit(False, {"error": error_msg})
+                    return False
+            else:
+                # Non-OOM RuntimeError, re-raise
+                error_msg = f"Failed to load model: {str(e)}"
+                logger.error(error_msg)
+                self.status_message.emit(error_msg)
+                self.finished.emit(False, {"error": error_msg})
+                return False
+        except Exception as e:
+            error_msg = f"Failed to load model: {str(e)}"
+            logger.error(error_msg)
+            self.status_message.emit(error_msg)
+            self.finished.emit(False, {"error": error_msg})
+            return False
+        
+        return True
+    
+    def cancel(self):
+        """Cancel the processing."""
+        self._is_cancelled = True
+        logger.info("Cancellation requested")
@@ -4,7 +4,7 @@ from PySide6.QtCore import QThread, Signal
 from typing import Dict, Any
 import logging
 
-from models.downloader import ModelDownloader
+from imagecaptioner.models.downloader import ModelDownloader
 
 logger = logging.getLogger(__name__)
 
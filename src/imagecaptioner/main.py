@@ -0,0 +1,87 @@
+"""Main entry point for the Image Captioning GUI application."""
+
+import sys
+import argparse
+import logging
+
+
+def main():
+    """Initialize and run the application."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Image Captioning Application")
+    parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run the resident caption server (keeps the model loaded between runs)')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help='Seconds without requests before the server unloads the model (0 = never)')
+    parser.add_argument('--caption', nargs='+', metavar='IMAGE',
+                        help='Caption images via the resident server (started if needed) and print the results')
+    parser.add_argument('--prompt', default=None, help='Prompt to use with --caption')
+    parser.add_argument('--stop-server', action='store_true', help='Shut down the resident caption server')
+    args = parser.parse_args()
+    
+    # Configure logging
+    log_level = logging.DEBUG if args.verbose else logging.INFO
+    logging.basicConfig(
+        level=log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%H:%M:%S'
+    )
+    
+    if args.verbose:
+        logging.info("Verbose logging enabled")
+    
+    if args.serve or args.caption or args.stop_server:
+        sys.exit(run_server_command(args))
+    
+    run_gui()
+
+
+def run_server_command(args: argparse.Namespace) -> int:
+    """Handle the resident-server command line options."""
+    from imagecaptioner import server
+    
+    if args.stop_server:
+        stopped = server.stop_server()
+        print("Caption server stopped" if stopped else "Caption server is not running")
+        return 0
+    
+    if args.serve:
+        idle_timeout = server.DEFAULT_IDLE_TIMEOUT if args.idle_timeout is None else args.idle_timeout
+        server.CaptionServer(idle_timeout=idle_timeout).serve_forever()
+        return 0
+    
+    exit_code = 0
+    for image_path, caption, error in server.caption_images(args.caption, prompt=args.prompt):
+        if error is None:
+            print(f"{image_path}\t{caption}")
+        else:
+            print(f"{image_path}\tERROR: {error}", file=sys.stderr)
+            exit_code = 1
+    return exit_code
+
+
+def run_gui():
+    """Start the Qt application."""
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import Qt
+    
+    from imagecaptioner.gui.main_window import MainWindow
+    
+    # Enable High DPI scaling
+    QApplication.setHighDpiScaleFactorRoundingPolicy(
+        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+    )
+    
+    app = QApplication(sys.argv)
+    app.setApplicationName("Image Captioning")
+    app.setOrganizationName("ImageCaptioning")
+    
+    window = MainWindow()
+    window.show()
+    
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
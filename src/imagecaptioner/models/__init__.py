@@ -0,0 +1,17 @@
+"""Model implementations for image captioning."""
+
+__all__ = ["VisionLanguageModel", "LLaVAModel", "ModelDownloader"]
+
+
+def __getattr__(name):
+    # Resolve lazily so importing the downloader doesn't pull in torch/transformers
+    if name == "ModelDownloader":
+        from .downloader import ModelDownloader
+        return ModelDownloader
+    if name == "VisionLanguageModel":
+        from .base import VisionLanguageModel
+        return VisionLanguageModel
+    if name == "LLaVAModel":
+        from .llava import LLaVAModel
+        return LLaVAModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
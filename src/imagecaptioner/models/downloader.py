@@ -1,9 +1,20 @@
 """Model downloader with progress tracking."""
 
 import os
+import json
+import time
+import shutil
+import importlib.util
 from pathlib import Path
 from typing import Optional, Callable, Tuple
-from huggingface_hub import snapshot_download, model_info
+
+# Use the Rust multi-connection downloader when available. This has to be set
+# before huggingface_hub is imported, and only if hf_transfer is installed
+# (the hub raises if the flag is on without the package).
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+from huggingface_hub import snapshot_download, model_info, try_to_load_from_cache
 from huggingface_hub.utils import HfHubHTTPError
 import logging
 
@@ -13,14 +24,28 @@ logger = logging.getLogger(__name__)
 class ModelDownloader:
     """Handle model downloading from Hugging Face Hub with progress tracking."""
     
-    def __init__(self, model_name: str = "llava-hf/llava-1.5-7b-hf"):
+    # Files needed to load the model; .bin weights are only added for repos
+    # without safetensors (see _get_allow_patterns), skipping duplicates
+    ALLOW_PATTERNS = ["*.safetensors", "*.json", "*.model", "*.txt"]
+    
+    # Files whose presence in the hub cache means the model is downloaded
+    REQUIRED_FILES = ["config.json", "preprocessor_config.json", "tokenizer_config.json"]
+    
+    # Download size lookups are cached on disk for a day
+    SIZE_CACHE_TTL = 24 * 60 * 60
+    DEFAULT_SIZE = (13.0, "~13 GB")  # LLaVA 1.5 7B
+    
+    def __init__(self, model_name: str = "llava-hf/llava-1.5-7b-hf", max_workers: Optional[int] = None):
         """
         Initialize the downloader.
         
         Args:
             model_name: Hugging Face model identifier
+            max_workers: Number of files downloaded in parallel. Defaults to
+                min(8, CPU count); lower it on slow disks.
         """
         self.model_name = model_name
+        self.max_workers = max_workers or min(8, os.cpu_count() or 4)
         self.cache_dir = self._get_cache_dir()
         self._cancelled = False
         
@@ -47,12 +72,11 @@ class ModelDownloader:
             True if model is cached, False otherwise
         """
         try:
-            # Try to get model info without downloading
-            from transformers import AutoProcessor
-            AutoProcessor.from_pretrained(
-                self.model_name,
-                local_files_only=True
-            )
+            # Pure filesystem lookup in the hub cache; nothing is instantiated
+            for filename in self.REQUIRED_FILES:
+                cached = try_to_load_from_cache(self.model_name, filename)
+                if not isinstance(cached, str):
+                    return False
             return True
         except Exception:
             return False
@@ -61,9 +85,23 @@ class ModelDownloader:
         """
         Get the estimated size of the model download.
         
+        The size is cached on disk for SIZE_CACHE_TTL seconds so repeated
+        checks don't pay a network round-trip. In offline mode
+        (HF_HUB_OFFLINE) only the cached value or the default is used.
+        
         Returns:
             Tuple of (size_in_gb, size_string)
         """
+        cache_file = self.cache_dir / "imagecaptioner_sizes" / f"{self.model_name.replace('/', '_')}.json"
+        offline = os.environ.get("HF_HUB_OFFLINE", "").lower() in ("1", "true", "yes", "on")
+        
+        cached = self._read_size_cache(cache_file, max_age=None if offline else self.SIZE_CACHE_TTL)
+        if cached is not None:
+            return cached
+        if offline:
+            logger.info("HF_HUB_OFFLINE set, using default model size estimate")
+            return self.DEFAULT_SIZE
+        
         try:
             info = model_info(self.model_name)
             
@@ -82,11 +120,51 @@ class ModelDownloader:
             else:
                 size_str = f"{size_gb:.1f} GB"
             
+            self._write_size_cache(cache_file, size_gb, size_str)
             return size_gb, size_str
         except Exception as e:
             logger.warning(f"Could not determine model size: {e}")
-            # Default estimate for LLaVA 1.5 7B
-            return 13.0, "~13 GB"
+            # Fall back to a stale cached value, then the LLaVA 1.5 7B estimate
+            return self._read_size_cache(cache_file, max_age=None) or self.DEFAULT_SIZE
+    
+    @staticmethod
+    def _read_size_cache(cache_file: Path, max_age: Optional[float]) -> Optional[Tuple[float, str]]:
+        """Return the cached (size_gb, size_str), or None if missing, unreadable or older than max_age."""
+        try:
+            if max_age is not None and time.time() - cache_file.stat().st_mtime > max_age:
+                return None
+            data = json.loads(cache_file.read_text(encoding="utf-8"))
+            return float(data["size_gb"]), str(data["size_str"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    @staticmethod
+    def _write_size_cache(cache_file: Path, size_gb: float, size_str: str):
+        """Write the size cache atomically (temp file + os.replace)."""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps({"size_gb": size_gb, "size_str": size_str}), encoding="utf-8")
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.debug(f"Could not cache model size: {e}")
+    
+    def _get_allow_patterns(self) -> list:
+        """
+        Get the file patterns to download for this model.
+        
+        Returns:
+            ALLOW_PATTERNS, plus "*.bin" if the repo ships no .safetensors
+            weights (or its file listing can't be fetched)
+        """
+        try:
+            info = model_info(self.model_name)
+            if any(sibling.rfilename.endswith(".safetensors") for sibling in info.siblings or []):
+                return list(self.ALLOW_PATTERNS)
+            logger.info("No safetensors weights in repo, downloading .bin weights")
+        except Exception as e:
+            logger.warning(f"Could not list repo files, including .bin weights: {e}")
+        return self.ALLOW_PATTERNS + ["*.bin"]
     
     def download_model(
         self,
@@ -110,7 +188,7 @@ class ModelDownloader:
             # Download the model
             # Note: snapshot_download doesn't provide fine-grained progress,
             # so we'll just show status updates
-            logger.info(f"Downloading model: {self.model_name}")
+            logger.info(f"Downloading model: {self.model_name} ({self.max_workers} parallel workers)")
             
             if progress_callback:
                 progress_callback(0, 0, "Downloading model files...")
@@ -119,6 +197,8 @@ class ModelDownloader:
                 repo_id=self.model_name,
                 local_files_only=False,
                 resume_download=True,
+                max_workers=self.max_workers,
+                allow_patterns=self._get_allow_patterns(),
             )
             
             if self._cancelled:
@@ -160,20 +240,12 @@ class ModelDownloader:
         """
         cache_path = self.cache_dir / "hub"
         
-        # Get available disk space
+        # Get available disk space on the volume that holds (or will hold) the cache
         try:
-            if os.name == "nt":  # Windows
-                import ctypes
-                free_bytes = ctypes.c_ulonglong(0)
-                ctypes.windll.kernel32.GetDiskFreeSpaceExW(
-                    ctypes.c_wchar_p(str(cache_path.drive)),
-                    None, None,
-                    ctypes.pointer(free_bytes)
-                )
-                available_gb = free_bytes.value / (1024 ** 3)
-            else:  # Unix-like
-                stat = os.statvfs(str(cache_path.parent))
-                available_gb = (stat.f_bavail * stat.f_frsize) / (1024 ** 3)
+            existing = cache_path
+            while not existing.exists() and existing != existing.parent:
+                existing = existing.parent
+            available_gb = shutil.disk_usage(str(existing)).free / (1024 ** 3)
         except Exception as e:
             logger.warning(f"Could not determine available space: {e}")
             available_gb = 0
@@ -0,0 +1,802 @@
+"""LLaVA model implementation."""
+
+import gc
+import torch
+import time
+import importlib.util
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+from PIL import Image
+import logging
+
+from transformers import (
+    LlavaProcessor, LlavaForConditionalGeneration,
+    BitsAndBytesConfig
+)
+
+from imagecaptioner.utils.image_io import load_rgb
+from .base import VisionLanguageModel
+
+logger = logging.getLogger(__name__)
+
+
+def _quantized_cache_backend() -> Optional[str]:
+    """Return the first installed quantized KV-cache backend, or None."""
+    for module_name, backend in (("optimum.quanto", "quanto"), ("hqq", "HQQ")):
+        try:
+            if importlib.util.find_spec(module_name) is not None:
+                return backend
+        except ModuleNotFoundError:
+            continue
+    return None
+
+
+class LLaVAModel(VisionLanguageModel):
+    """LLaVA 1.5 model implementation with quantization support."""
+    
+    # Seconds to wait before retrying a weight load that ran out of GPU memory
+    OOM_RETRY_DELAY = 30
+    
+    DEFAULT_PROMPT = "Describe this image in detail:"
+    
+    def __init__(
+        self,
+        model_name: str = "llava-hf/llava-1.5-7b-hf",
+        device: str = "auto",
+        quantization: str = "auto",
+        kv_cache_bits: Optional[int] = None,
+        compile_model: bool = False,
+        **kwargs
+    ):
+        """
+        Initialize LLaVA model.
+        
+        Args:
+            model_name: Hugging Face model identifier
+            device: Device to use ('auto', 'cpu', 'cuda')
+            quantization: Quantization mode ('auto', 'none', '4bit', '8bit')
+            kv_cache_bits: Quantize the KV cache to this many bits (2 or 4) during
+                generation. Requires optimum-quanto or hqq; None disables it.
+            compile_model: torch.compile the forward pass and decode with a static
+                KV cache (CUDA only, torch >= 2.3). Slower first load, faster decode.
+            **kwargs: Additional arguments
+        """
+        super().__init__(device=device, **kwargs)
+        self.model_name = model_name
+        self.quantization = quantization
+        self.kv_cache_bits = kv_cache_bits
+        self.compile_model = compile_model
+        self._compiled = False
+        self._kv_cache_kwargs: Dict[str, Any] = {}
+        self._prompt_cache: Dict[str, Dict[str, torch.Tensor]] = {}
+        self._device_map = None
+        self._quantization_config = None
+        self._transfer_stream = None
+        self._transfer_done = None
+        self._pinned_buffers: Dict[str, torch.Tensor] = {}
+        self._torch_dtype = torch.float32
+        self._attn_impl = None
+        
+        # Determine actual device and quantization settings
+        self._configure_device_and_quantization()
+    
+    def _configure_device_and_quantization(self):
+        """Configure device and quantization settings based on hardware."""
+        # Determine device
+        if self.device == "auto":
+            if torch.cuda.is_available():
+                self.device = "cuda"
+                logger.info(f"CUDA available: {torch.cuda.get_device_name(0)}")
+            else:
+                self.device = "cpu"
+                logger.info("CUDA not available, using CPU")
+        
+        # Determine quantization
+        if self.device == "cuda" and self.quantization == "auto":
+            # Auto-select quantization based on available VRAM
+            try:
+                vram_gb = torch.cuda.get_device_properties(0).total_memory / (1024**3)
+                logger.info(f"Available VRAM: {vram_gb:.1f} GB")
+                
+                if vram_gb < 8:
+                    self.quantization = "4bit"
+                    logger.info("Auto-selected 4-bit quantization (VRAM < 8GB)")
+                elif vram_gb < 16:
+                    self.quantization = "8bit"
+                    logger.info("Auto-selected 8-bit quantization (VRAM < 16GB)")
+                else:
+                    self.quantization = "none"
+                    logger.info("No quantization needed (VRAM >= 16GB)")
+            except Exception as e:
+                logger.warning(f"Could not determine VRAM, using 4-bit: {e}")
+                self.quantization = "4bit"
+        elif self.device == "cpu":
+            self.quantization = "none"
+            logger.info("CPU mode: quantization disabled")
+        elif self.quantization == "auto":
+            self.quantization = "none"
+        
+        # Configure compute dtype and attention kernel
+        self._torch_dtype = self._select_torch_dtype()
+        self._attn_impl = self._select_attention_implementation()
+        logger.info(f"Compute dtype: {self._torch_dtype}, attention: {self._attn_impl or 'default (sdpa/eager)'}")
+        
+        # Configure quantization
+        if self.quantization == "4bit" and self.device == "cuda":
+            self._quantization_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=self._torch_dtype,
+                bnb_4bit_use_double_quant=True,
+                bnb_4bit_quant_type="nf4"
+            )
+            self._device_map = "auto"
+            logger.info("Configured 4-bit quantization")
+        elif self.quantization == "8bit" and self.device == "cuda":
+            self._quantization_config = BitsAndBytesConfig(
+                load_in_8bit=True
+            )
+            self._device_map = "auto"
+            logger.info("Configured 8-bit quantization")
+        else:
+            self._quantization_config = None
+            self._device_map = self.device
+            logger.info(f"No quantization, using device: {self.device}")
+    
+    def _get_compute_capability(self) -> Tuple[int, int]:
+        """Get the CUDA compute capability of device 0, or (0, 0) if unavailable."""
+        if self.device != "cuda":
+            return (0, 0)
+        try:
+            return torch.cuda.get_device_capability(0)
+        except Exception as e:
+            logger.warning(f"Could not determine compute capability: {e}")
+            return (0, 0)
+    
+    def _select_torch_dtype(self) -> torch.dtype:
+        """Pick bf16 on Ampere+ (SM80+), fp16 on older GPUs and fp32 on CPU."""
+        if self.device != "cuda":
+            return torch.float32
+        if self._get_compute_capability() >= (8, 0):
+            return torch.bfloat16
+        return torch.float16
+    
+    def _select_attention_implementation(self) -> Optional[str]:
+        """
+        Pick Flash-Attention 2 when the GPU and package support it.
+        
+        Returns None otherwise, letting transformers use its default (SDPA when
+        the model supports it, eager attention otherwise).
+        """
+        if self._get_compute_capability() < (8, 0):
+            return None
+        try:
+            import flash_attn  # noqa: F401
+        except ImportError:
+            logger.info("flash-attn not installed, using default attention")
+            return None
+        return "flash_attention_2"
+    
+    def load(self) -> None:
+        """Load the LLaVA model and processor."""
+        if self.model is not None:
+            # Free the old weights first so a reload never holds two copies
+            logger.info("Unloading previously loaded model before reloading")
+            self.unload()
+            gc.collect()
+        
+        try:
+            logger.info("=== Starting Model Load ===")
+            logger.info(f"Model: {self.model_name}")
+            logger.info(f"Requested device: {self.device}, Quantization: {self.quantization}")
+            
+            # Check GPU status if using CUDA
+            if torch.cuda.is_available():
+                logger.info(f"CUDA available: {torch.cuda.get_device_name(0)}")
+                props = torch.cuda.get_device_properties(0)
+                logger.info(f"CUDA total memory: {props.total_memory / 1e9:.2f} GB")
+                logger.info(f"CUDA memory allocated: {torch.cuda.memory_allocated(0) / 1e9:.2f} GB")
+                logger.info(f"CUDA memory reserved: {torch.cuda.memory_reserved(0) / 1e9:.2f} GB")
+            else:
+                logger.info("CUDA not available, will use CPU")
+            
+            logger.info(f"Device map: {self._device_map}")
+            logger.info(f"Quantization config: {self._quantization_config}")
+            
+            # Load processor
+            logger.info(f"Loading processor from {self.model_name}...")
+            self.processor = LlavaProcessor.from_pretrained(
+                self.model_name,
+                trust_remote_code=False
+            )
+            logger.info("✓ Processor loaded successfully")
+            
+            # Load model with quantization config, giving other CUDA workloads
+            # one chance to release memory before reporting OOM
+            retry_after_oom = False
+            try:
+                self._load_weights()
+            except torch.cuda.OutOfMemoryError:
+                # Only flag here: the live exception's traceback still references
+                # the partially loaded tensors, so cleanup has to wait until the
+                # except block has been left
+                self.model = None
+                retry_after_oom = True
+            
+            if retry_after_oom:
+                gc.collect()
+                torch.cuda.empty_cache()
+                logger.warning(f"CUDA out of memory loading weights, retrying in {self.OOM_RETRY_DELAY}s...")
+                time.sleep(self.OOM_RETRY_DELAY)
+                self._load_weights()
+            
+            # Set model to eval mode and drop autograd bookkeeping for good
+            self.model.eval()
+            self.model.requires_grad_(False)
+            logger.info("✓ Model set to eval mode")
+            
+            # Pre-expand the default prompt so the first image skips the full processor
+            self._build_prompt_template(self.DEFAULT_PROMPT)
+            
+            self._kv_cache_kwargs = self._select_kv_cache_kwargs()
+            
+            if self.compile_model:
+                self._compile_forward()
+            
+            logger.info("✓ Model loaded successfully")
+            logger.info("=== Model Load Complete ===")
+            
+        except torch.cuda.OutOfMemoryError as e:
+            logger.error("CUDA out of memory!")
+            raise RuntimeError(
+                "GPU out of memory. Try:\n"
+                "1. Enable 4-bit or 8-bit quantization\n"
+                "2. Close other GPU applications\n"
+                "3. Use a smaller model\n"
+                "4. Use CPU mode (very slow)"
+            ) from e
+        except Exception as e:
+            logger.error(f"Failed to load model: {e}")
+            raise
+    
+    def _load_weights(self) -> None:
+        """Load the model weights, quantized or full precision, onto the device."""
+        logger.info("Loading model weights... (this may take 10-60 seconds)")
+        if self._quantization_config:
+            logger.info("Using quantized model loading")
+            self.model = LlavaForConditionalGeneration.from_pretrained(
+                self.model_name,
+                quantization_config=self._quantization_config,
+                device_map=self._device_map,
+                torch_dtype=self._torch_dtype,
+                low_cpu_mem_usage=True,
+                trust_remote_code=False,
+                **self._attn_kwargs()
+            )
+            logger.info("✓ Quantized model loaded")
+        else:
+            logger.info("Using full precision model loading")
+            # Shards are streamed straight to the target device, so no
+            # follow-up .to() (and second weight copy) is needed
+            self.model = LlavaForConditionalGeneration.from_pretrained(
+                self.model_name,
+                device_map={"": self.device},
+                torch_dtype=self._torch_dtype,
+                low_cpu_mem_usage=True,
+                trust_remote_code=False,
+                **self._attn_kwargs()
+            )
+            logger.info(f"✓ Model loaded on {next(self.model.parameters()).device}")
+    
+    def _select_kv_cache_kwargs(self) -> Dict[str, Any]:
+        """
+        Build generate() kwargs for a quantized KV cache.
+        
+        Returns an empty dict (default fp16/bf16 cache) when disabled, on CPU,
+        when no backend is installed, or when the model doesn't support it.
+        """
+        if not self.kv_cache_bits or self.device != "cuda":
+            return {}
+        
+        backend = _quantized_cache_backend()
+        if backend is None:
+            logger.warning("KV cache quantization requested but neither optimum-quanto nor hqq is installed")
+            return {}
+        
+        if not getattr(self.model, "_supports_quantized_cache", False):
+            logger.warning("This transformers version doesn't support a quantized KV cache for LLaVA")
+            return {}
+        
+        logger.info(f"Using {self.kv_cache_bits}-bit KV cache ({backend})")
+        return {
+            "cache_implementation": "quantized",
+            "cache_config": {"backend": backend, "nbits": self.kv_cache_bits},
+        }
+    
+    def _compile_forward(self) -> None:
+        """
+        Compile the forward pass so the decode loop runs as a CUDA graph.
+        
+        Uses mode="reduce-overhead" with a static KV cache, which removes the
+        per-token Python/dispatcher overhead. A short warm-up generation pays
+        the compilation cost here instead of on the first user image. Any
+        failure restores the eager forward.
+        """
+        if self.device != "cuda":
+            logger.info("torch.compile skipped: only used on CUDA")
+            return
+        
+        version = tuple(int(part) for part in torch.__version__.split("+")[0].split(".")[:2])
+        if version < (2, 3):
+            logger.warning(f"torch.compile skipped: torch {torch.__version__} < 2.3")
+            return
+        
+        if self._kv_cache_kwargs:
+            logger.warning("Static cache for torch.compile replaces the quantized KV cache")
+        
+        eager_forward = self.model.forward
+        try:
+            logger.info("Compiling model forward (this may take a minute)...")
+            self.model.forward = torch.compile(
+                eager_forward,
+                mode="reduce-overhead",
+                fullgraph=False,
+                dynamic=False
+            )
+            self._compiled = True
+            
+            warmup_start = time.time()
+            self.generate_captions_batch(
+                [("warmup", Image.new("RGB", (336, 336)))],
+                max_new_tokens=2,
+                do_sample=False
+            )
+            logger.info(f"✓ Model compiled and warmed up in {time.time() - warmup_start:.1f}s")
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager forward: {e}")
+            self.model.forward = eager_forward
+            self._compiled = False
+    
+    @staticmethod
+    def _bucket_max_new_tokens(max_new_tokens: int) -> int:
+        """Round up to the next power of two so static cache shapes repeat."""
+        return 1 << max(0, int(max_new_tokens) - 1).bit_length()
+    
+    def _attn_kwargs(self) -> Dict[str, Any]:
+        """Extra from_pretrained() kwargs selecting the attention kernel."""
+        if self._attn_impl is None:
+            return {}
+        return {"attn_implementation": self._attn_impl}
+    
+    def generate_caption(
+        self,
+        prompt: str = "Describe this image in detail:",
+        image_path: Optional[str] = None,
+        image: Optional[Image.Image] = None,
+        temperature: float = 0.2,
+        max_new_tokens: int = 512,
+        top_p: float = 0.9,
+        top_k: int = 50,
+        repetition_penalty: float = 1.1,
+        do_sample: bool = True,
+        num_beams: int = 1,
+        **kwargs
+    ) -> str:
+        """
+        Generate a caption for an image.
+        
+        Args:
+            prompt: Text prompt for caption generation
+            image_path: Path to the image file (if image not provided)
+            image: PIL Image object (if path not provided)
+            temperature: Sampling temperature (0.0 = deterministic, higher = more random)
+            max_new_tokens: Maximum number of tokens to generate
+            top_p: Nucleus sampling threshold
+            top_k: Top-k sampling parameter
+            repetition_penalty: Penalty for repeating tokens
+            do_sample: Whether to use sampling (vs greedy decoding)
+            num_beams: Number of beams for beam search
+            **kwargs: Additional generation parameters
+            
+        Returns:
+            Generated caption as string
+        """
+        if not self.is_loaded():
+            raise RuntimeError("Model not loaded. Call load() first.")
+        
+        # Accept either path or PIL Image
+        if image is None and image_path is None:
+            raise ValueError("Must provide either image_path or image")
+        
+        image_name = Path(image_path).name if image_path else "PIL Image"
+        
+        try:
+            # Load image if path provided
+            if image is None:
+                image = load_rgb(image_path)
+                logger.debug("Loaded image from path: %s", image_name)
+            else:
+                # Ensure RGB mode
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+                logger.debug("Using provided PIL Image: %s", image.size)
+            
+            logger.debug("Prompt: %s", prompt[:100])
+            
+            # Process inputs (prompt tokenization is cached per prompt)
+            logger.debug("Processing inputs for %s", image_name)
+            inputs = self._prepare_inputs(prompt, [image])
+            
+            # CRITICAL: Always move inputs to correct device
+            inputs = self._move_inputs_to_device(inputs)
+            prompt_len = inputs["input_ids"].shape[1]
+            
+            # Verify inputs are on correct device
+            if logger.isEnabledFor(logging.DEBUG):
+                for k, v in inputs.items():
+                    logger.debug("  %s: device=%s, dtype=%s, shape=%s", k, v.device, v.dtype, tuple(v.shape))
+            
+            # Generate caption
+            logger.debug("Starting generation...")
+            gen_start = time.time()
+            
+            with torch.inference_mode():
+                output = self.model.generate(
+                    **inputs,
+                    **self._generation_kwargs(
+                        temperature=temperature,
+                        max_new_tokens=max_new_tokens,
+                        top_p=top_p,
+                        top_k=top_k,
+                        repetition_penalty=repetition_penalty,
+                        do_sample=do_sample,
+                        num_beams=num_beams,
+                        **kwargs
+                    )
+                )
+            
+            gen_time = time.time() - gen_start
+            logger.info("⚡ Generation took %.2fs for %s", gen_time, image_name)
+            
+            # Decode only the response tokens (capped in case the compiled path
+            # bucketed max_new_tokens); the prompt is never detokenized
+            caption = self.processor.decode(
+                output[0, prompt_len:prompt_len + max_new_tokens],
+                skip_special_tokens=True
+            ).strip()
+            
+            return caption
+            
+        except Exception as e:
+            logger.error("Error generating caption for %s: %s", image_name, e)
+            raise
+    
+    def generate_captions_batch(
+        self,
+        items: List[Tuple[str, Image.Image]],
+        prompt: str = "Describe this image in detail:",
+        temperature: float = 0.2,
+        max_new_tokens: int = 512,
+        top_p: float = 0.9,
+        top_k: int = 50,
+        repetition_penalty: float = 1.1,
+        do_sample: bool = True,
+        num_beams: int = 1,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate captions for several images with a single generate() call.
+        
+        All images share the prompt, so they are processed into one padded
+        batch. This amortizes the processor, host-to-device copies and kernel
+        launches across the batch instead of paying them per image.
+        
+        Args:
+            items: List of (image_name, PIL Image) tuples
+            prompt: Text prompt for caption generation
+            temperature: Sampling temperature (0.0 = deterministic, higher = more random)
+            max_new_tokens: Maximum number of tokens to generate
+            top_p: Nucleus sampling threshold
+            top_k: Top-k sampling parameter
+            repetition_penalty: Penalty for repeating tokens
+            do_sample: Whether to use sampling (vs greedy decoding)
+            num_beams: Number of beams for beam search
+            **kwargs: Additional generation parameters
+            
+        Returns:
+            Generated captions, in the same order as items
+        """
+        if not items:
+            return []
+        
+        inputs = self.preprocess_batch([image for _, image in items], prompt)
+        return self.generate_from_inputs(
+            inputs,
+            temperature=temperature,
+            max_new_tokens=max_new_tokens,
+            top_p=top_p,
+            top_k=top_k,
+            repetition_penalty=repetition_penalty,
+            do_sample=do_sample,
+            num_beams=num_beams,
+            **kwargs
+        )
+    
+    def preprocess_batch(
+        self,
+        images: List[Image.Image],
+        prompt: str = "Describe this image in detail:"
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Run the CPU side of captioning: RGB conversion and processor preprocessing.
+        
+        Touches no GPU state, so it can run on a background thread while the
+        previous batch is still generating.
+        
+        Args:
+            images: PIL images that share the prompt
+            prompt: Text prompt for caption generation
+            
+        Returns:
+            Model inputs as CPU tensors, ready for generate_from_inputs()
+        """
+        if not self.is_loaded():
+            raise RuntimeError("Model not loaded. Call load() first.")
+        
+        images = [image if image.mode == 'RGB' else image.convert('RGB') for image in images]
+        
+        # Every row shares the prompt, so the batch needs no padding
+        return self._prepare_inputs(prompt, images)
+    
+    def generate_from_inputs(
+        self,
+        inputs: Dict[str, torch.Tensor],
+        temperature: float = 0.2,
+        max_new_tokens: int = 512,
+        top_p: float = 0.9,
+        top_k: int = 50,
+        repetition_penalty: float = 1.1,
+        do_sample: bool = True,
+        num_beams: int = 1,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate captions from inputs built by preprocess_batch().
+        
+        Args:
+            inputs: CPU model inputs from preprocess_batch()
+            temperature: Sampling temperature
+            max_new_tokens: Maximum number of tokens to generate
+            top_p: Nucleus sampling threshold
+            top_k: Top-k sampling parameter
+            repetition_penalty: Penalty for repeating tokens
+            do_sample: Whether to use sampling (vs greedy decoding)
+            num_beams: Number of beams for beam search
+            **kwargs: Additional generation parameters
+            
+        Returns:
+            Generated captions, one per row of inputs
+        """
+        if not self.is_loaded():
+            raise RuntimeError("Model not loaded. Call load() first.")
+        
+        inputs = self._move_inputs_to_device(inputs)
+        batch_len, prompt_len = inputs["input_ids"].shape
+        
+        gen_start = time.time()
+        with torch.inference_mode():
+            output = self.model.generate(
+                **inputs,
+                **self._generation_kwargs(
+                    temperature=temperature,
+                    max_new_tokens=max_new_tokens,
+                    top_p=top_p,
+                    top_k=top_k,
+                    repetition_penalty=repetition_penalty,
+                    do_sample=do_sample,
+                    num_beams=num_beams,
+                    **kwargs
+                )
+            )
+        gen_time = time.time() - gen_start
+        logger.info("⚡ Generation took %.2fs for batch of %d images", gen_time, batch_len)
+        
+        # Drop the prompt tokens so only the assistant's response is decoded
+        captions = self.processor.batch_decode(
+            output[:, prompt_len:prompt_len + max_new_tokens],
+            skip_special_tokens=True
+        )
+        return [caption.strip() for caption in captions]
+    
+    def _prepare_inputs(self, prompt: str, images: List[Image.Image]) -> Dict[str, torch.Tensor]:
+        """
+        Build CPU model inputs for RGB images that share a prompt.
+        
+        The chat-template tokenization (including the processor's expansion of
+        <image> into per-patch placeholder tokens) is identical for every image
+        with the same prompt, so it is computed once per prompt from a tiny
+        dummy image and cached. Only the image processor runs on each call.
+        
+        Args:
+            prompt: Text prompt for caption generation
+            images: RGB PIL images
+            
+        Returns:
+            Dictionary with input_ids, attention_mask and pixel_values
+        """
+        cached = self._prompt_cache.get(prompt)
+        if cached is None:
+            cached = self._build_prompt_template(prompt)
+        
+        pixel_values = self.processor.image_processor(images, return_tensors="pt")["pixel_values"]
+        batch_size = len(images)
+        
+        return {
+            "input_ids": cached["input_ids"].repeat(batch_size, 1),
+            "attention_mask": cached["attention_mask"].repeat(batch_size, 1),
+            "pixel_values": pixel_values,
+        }
+    
+    def _build_prompt_template(self, prompt: str) -> Dict[str, torch.Tensor]:
+        """Tokenize the chat template for prompt and cache the expanded ids/mask."""
+        # For LLaVA 1.5, use simple USER/ASSISTANT format
+        # Note: The processor adds <image> tokens automatically
+        text_prompt = f"USER: <image>\n{prompt}\nASSISTANT:"
+        
+        # The image is resized to the processor's fixed resolution, so its
+        # content doesn't affect the token expansion
+        text_inputs = self.processor(
+            text=text_prompt,
+            images=Image.new("RGB", (32, 32)),
+            return_tensors="pt"
+        )
+        cached = {
+            "input_ids": text_inputs["input_ids"],
+            "attention_mask": text_inputs["attention_mask"],
+        }
+        self._prompt_cache[prompt] = cached
+        logger.debug("Cached prompt tokenization (%d tokens)", cached["input_ids"].shape[1])
+        return cached
+    
+    def _generation_kwargs(
+        self,
+        temperature: float,
+        max_new_tokens: int,
+        top_p: float,
+        top_k: int,
+        repetition_penalty: float,
+        do_sample: bool,
+        num_beams: int,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the keyword arguments shared by every generate() call."""
+        cache_kwargs = self._kv_cache_kwargs
+        if self._compiled:
+            # Bucketed so the CUDA graph and static cache are reused across calls;
+            # callers trim the output back to the requested length
+            max_new_tokens = self._bucket_max_new_tokens(max_new_tokens)
+            cache_kwargs = {"cache_implementation": "static"}
+        
+        return {
+            "max_new_tokens": max_new_tokens,
+            "temperature": temperature if do_sample else 1.0,
+            "top_p": top_p if do_sample else 1.0,
+            "top_k": top_k,
+            "repetition_penalty": repetition_penalty,
+            "do_sample": do_sample,
+            "num_beams": num_beams,
+            "pad_token_id": self.processor.tokenizer.pad_token_id,
+            "eos_token_id": self.processor.tokenizer.eos_token_id,
+            **cache_kwargs,
+            **kwargs
+        }
+    
+    def _move_inputs_to_device(self, inputs: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """
+        Move processor outputs to the model's device.
+        
+        On CUDA the tensors are staged in pinned host buffers and copied with
+        non_blocking=True on a dedicated transfer stream, so the copy skips the
+        driver's pageable staging buffer and can overlap with work already
+        queued on the compute stream. The pinned buffers persist across calls
+        (grown to the largest batch seen) to avoid paying pinning per call.
+        
+        Args:
+            inputs: Processor outputs (CPU tensors)
+            
+        Returns:
+            Dictionary of tensors on the target device
+        """
+        if self.device != "cuda":
+            # Processor outputs already live on the CPU
+            return inputs
+        
+        logger.debug("Moving inputs to cuda (pinned, non-blocking)")
+        if self._transfer_stream is None:
+            self._transfer_stream = torch.cuda.Stream()
+        
+        if self._transfer_done is not None:
+            # The previous copy must finish reading the staging buffers before they're reused
+            self._transfer_done.synchronize()
+        
+        compute_stream = torch.cuda.current_stream()
+        with torch.cuda.stream(self._transfer_stream):
+            moved = {
+                k: self._stage_pinned(k, v).to("cuda", non_blocking=True)
+                for k, v in inputs.items()
+            }
+            self._transfer_done = torch.cuda.Event()
+            self._transfer_done.record()
+        
+        # Generation must not start before the copies land
+        compute_stream.wait_stream(self._transfer_stream)
+        for v in moved.values():
+            # Tensors were allocated on the transfer stream but are consumed on the compute stream
+            v.record_stream(compute_stream)
+        
+        return moved
+    
+    def _stage_pinned(self, name: str, tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Copy a CPU tensor into the persistent pinned buffer for this input.
+        
+        Args:
+            name: Input name (one buffer per name)
+            tensor: CPU tensor to stage
+            
+        Returns:
+            View of the pinned buffer with the tensor's shape and contents
+        """
+        numel = tensor.numel()
+        buffer = self._pinned_buffers.get(name)
+        if buffer is None or buffer.dtype != tensor.dtype or buffer.numel() < numel:
+            buffer = torch.empty(numel, dtype=tensor.dtype, pin_memory=True)
+            self._pinned_buffers[name] = buffer
+        
+        staged = buffer[:numel].view(tensor.shape)
+        staged.copy_(tensor)
+        return staged
+    
+    def unload(self) -> None:
+        """Unload the model to free memory."""
+        if self.model is not None:
+            del self.model
+            self.model = None
+            logger.info("Model unloaded")
+        
+        if self.processor is not None:
+            del self.processor
+            self.processor = None
+        self._prompt_cache.clear()
+        self._pinned_buffers.clear()
+        self._transfer_done = None
+        self._compiled = False
+        
+        # Clear CUDA cache if using GPU
+        if self.device == "cuda" and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            logger.info("CUDA cache cleared")
+    
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get information about the loaded model."""
+        info = super().get_model_info()
+        info.update({
+            "quantization": self.quantization,
+            "torch_dtype": str(self._torch_dtype),
+            "attn_implementation": self._attn_impl or "default",
+            "kv_cache": "static" if self._compiled else self._kv_cache_kwargs.get("cache_implementation", "default"),
+            "compiled": self._compiled,
+            "device_map": str(self._device_map) if self._device_map else None,
+        })
+        
+        if self.device == "cuda" and torch.cuda.is_available():
+            info["cuda_device"] = torch.cuda.get_device_name(0)
+            info["cuda_memory_allocated_gb"] = torch.cuda.memory_allocated(0) / (1024**3)
+            info["cuda_memory_reserved_gb"] = torch.cuda.memory_reserved(0) / (1024**3)
+        
+        return info
+    
+    def clear_cache(self):
+        """Clear CUDA cache to free memory."""
+        if self.device == "cuda" and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            logger.debug("CUDA cache cleared")
@@ -0,0 +1,245 @@
+"""Batch processing logic for multiple images."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator
+import logging
+import time
+
+from .image_processor import ImageProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class BatchProcessor:
+    """Manage batch processing of multiple images."""
+    
+    def __init__(self, skip_errors: bool = True):
+        """
+        Initialize batch processor.
+        
+        Args:
+            skip_errors: Whether to skip errors and continue processing
+        """
+        self.image_processor = ImageProcessor()
+        self.skip_errors = skip_errors
+        
+        # Results and errors are stored column-wise; row dicts are only built
+        # on demand by get_results()/get_errors()
+        self._result_paths: List[Path] = []
+        self._result_captions: List[str] = []
+        self._result_metadata: List[Optional[Dict[str, Any]]] = []
+        self._error_paths: List[Path] = []
+        self._error_messages: List[str] = []
+        self._error_stages: List[str] = []
+        
+        # File sizes seen by the last prepare_batch() scan, so preparing an
+        # image for inference doesn't stat() it again
+        self._file_sizes: Dict[Path, int] = {}
+    
+    def prepare_batch(
+        self,
+        directory: Path,
+        recursive: bool = False,
+        fast_validation: bool = False
+    ) -> List[Path]:
+        """
+        Prepare a batch of images for processing.
+        
+        Args:
+            directory: Directory containing images
+            recursive: Whether to scan subdirectories
+            fast_validation: Only check that image headers are readable
+                (memory-mapped, no decode). Truncated or corrupt pixel data then
+                passes validation and fails later as a "processing" error.
+            
+        Returns:
+            List of valid image paths
+        """
+        # Scan directory
+        sized_images = self.image_processor.scan_directory_with_sizes(directory, recursive)
+        self._file_sizes = dict(sized_images)
+        all_images = [img_path for img_path, _ in sized_images]
+        
+        if not all_images:
+            logger.warning(f"No images found in {directory}")
+            return []
+        
+        # Validate images (in parallel)
+        valid_images = []
+        for img_path, is_valid, error_msg in self.image_processor.validate_images_parallel(
+            all_images, fast=fast_validation
+        ):
+            if is_valid:
+                valid_images.append(img_path)
+            else:
+                logger.warning(f"Invalid image {img_path.name}: {error_msg}")
+                self.add_error(img_path, error_msg, stage="validation")
+        
+        logger.info(f"Prepared {len(valid_images)} valid images out of {len(all_images)} total")
+        return valid_images
+    
+    @staticmethod
+    def iter_batches(image_paths: List[Path], batch_size: int) -> Iterator[List[Path]]:
+        """
+        Split image paths into consecutive micro-batches for inference.
+        
+        Args:
+            image_paths: Image paths, typically from prepare_batch()
+            batch_size: Maximum number of images per batch
+            
+        Yields:
+            Lists of at most batch_size paths, in original order
+        """
+        batch_size = max(1, int(batch_size))
+        for start in range(0, len(image_paths), batch_size):
+            yield image_paths[start:start + batch_size]
+    
+    def process_with_model(
+        self,
+        model,
+        image_paths: List[Path],
+        prompt: str,
+        batch_size: int = 1,
+        processing_config: Optional[Dict[str, Any]] = None,
+        export_dir: Optional[Path] = None,
+        **generation_kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Caption images batch by batch, preparing the next batch during generation.
+        
+        Decoding, resizing and the model's CPU preprocessing for batch N+1 run
+        on a background thread while the GPU generates captions for batch N,
+        so throughput is bound by the slower stage rather than their sum.
+        
+        Args:
+            model: Loaded model exposing preprocess_batch() and generate_from_inputs()
+            image_paths: Image paths, typically from prepare_batch()
+            prompt: Text prompt shared by every image
+            batch_size: Maximum number of images per generate() call
+            processing_config: Resize settings for prepare_image_for_inference()
+            export_dir: Export directory used for resize caching
+            **generation_kwargs: Parameters passed to generate_from_inputs()
+            
+        Yields:
+            One dictionary per batch with keys:
+                paths: All paths in the batch, in order
+                items: (path, processed_image, metadata) tuples that were prepared
+                failures: (path, exception) tuples for images that failed to prepare
+                captions: Captions for items, or None if the batch failed
+                error: Exception from preprocessing/generation, or None
+                generation_time: Seconds spent generating the batch
+        """
+        processing_config = processing_config or {}
+        
+        def prepare(batch_paths: List[Path]) -> Dict[str, Any]:
+            batch = {"paths": batch_paths, "items": [], "failures": [], "inputs": None, "error": None}
+            for image_path in batch_paths:
+                try:
+                    processed_img, metadata = self.image_processor.prepare_image_for_inference(
+                        image_path=image_path,
+                        processing_config=processing_config,
+                        export_dir=export_dir,
+                        file_size=self._file_sizes.get(image_path)
+                    )
+                    batch["items"].append((image_path, processed_img, metadata))
+                except Exception as e:
+                    batch["failures"].append((image_path, e))
+            
+            if batch["items"]:
+                try:
+                    batch["inputs"] = model.preprocess_batch(
+                        [image for _, image, _ in batch["items"]], prompt
+                    )
+                except Exception as e:
+                    batch["error"] = e
+            return batch
+        
+        batches = self.iter_batches(image_paths, batch_size)
+        
+        # One background thread is enough to stay a batch ahead of the GPU
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") as executor:
+            first = next(batches, None)
+            pending = executor.submit(prepare, first) if first is not None else None
+            
+            while pending is not None:
+                batch = pending.result()
+                following = next(batches, None)
+                pending = executor.submit(prepare, following) if following is not None else None
+                
+                captions = None
+                start_time = time.time()
+                if batch["inputs"] is not None:
+                    try:
+                        captions = model.generate_from_inputs(batch.pop("inputs"), **generation_kwargs)
+                    except Exception as e:
+                        batch["error"] = e
+                batch.pop("inputs", None)
+                batch["captions"] = captions
+                batch["generation_time"] = time.time() - start_time
+                
+                yield batch
+    
+    def add_result(self, image_path: Path, caption: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Add a successful result.
+        
+        Args:
+            image_path: Path to the image
+            caption: Generated caption
+            metadata: Optional metadata dictionary
+        """
+        self._result_paths.append(image_path)
+        self._result_captions.append(caption)
+        self._result_metadata.append(metadata or None)
+    
+    def add_error(self, image_path: Path, error: str, stage: str = "processing"):
+        """
+        Add an error.
+        
+        Args:
+            image_path: Path to the image
+            error: Error message
+            stage: Processing stage where error occurred
+        """
+        self._error_paths.append(image_path)
+        self._error_messages.append(error)
+        self._error_stages.append(stage)
+    
+    def get_results(self) -> List[Dict[str, Any]]:
+        """Get all successful results."""
+        results = []
+        for path, caption, metadata in zip(self._result_paths, self._result_captions, self._result_metadata):
+            result = {"path": path, "caption": caption, "success": True}
+            if metadata:
+                result.update(metadata)
+            results.append(result)
+        return results
+    
+    def get_errors(self) -> List[Dict[str, Any]]:
+        """Get all errors."""
+        return [
+            {"path": path, "error": error, "stage": stage}
+            for path, error, stage in zip(self._error_paths, self._error_messages, self._error_stages)
+        ]
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get processing summary."""
+        total_processed = len(self._result_paths)
+        total_errors = len(self._error_paths)
+        total = total_processed + total_errors
+        success_rate = total_processed / total if total > 0 else 0.0
+        return {
+            "total_processed": total_processed,
+            "total_errors": total_errors,
+            "success_rate": success_rate,
+        }
+    
+    def reset(self):
+        """Reset processor state."""
+        for column in (
+            self._result_paths, self._result_captions, self._result_metadata,
+            self._error_paths, self._error_messages, self._error_stages,
+        ):
+            column.clear()
+        self._file_sizes.clear()
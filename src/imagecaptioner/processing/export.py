@@ -2,17 +2,37 @@
 
 import csv
 import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import logging
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Characters that make csv.writer (QUOTE_MINIMAL) quote a field
+_CSV_NEEDS_QUOTING = re.compile(r'[,"\r\n]')
+
+
+def _json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0, default=str)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=str).encode('utf-8')
+
 
 class CaptionExporter:
     """Handle exporting captions to various formats."""
     
+    WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB buffer for the single-file exports
+    
     def __init__(self, output_directory: Optional[Path] = None):
         """
         Initialize exporter.
@@ -34,8 +54,12 @@ class CaptionExporter:
             Number of files written
         """
         output_dir = output_dir or self.output_directory
-        count = 0
         
+        # Keyed by output path: images sharing a stem (a.jpg, a.png) map to the
+        # same .txt, and the last result wins as with serial writes. Concurrent
+        # writes to one path would interleave.
+        pairs = {}
+        encoded = {}  # Identical captions are encoded only once
         for result in results:
             image_path = result.get('path')
             caption = result.get('caption', '')
@@ -43,25 +67,37 @@ class CaptionExporter:
             if not image_path or not caption:
                 continue
             
-            try:
-                # Determine output path
-                if output_dir:
-                    txt_path = output_dir / f"{image_path.stem}.txt"
-                else:
-                    # Save next to image
-                    txt_path = image_path.with_suffix('.txt')
-                
-                # Write caption
-                txt_path.write_text(caption, encoding='utf-8')
-                count += 1
-                logger.debug(f"Wrote caption to {txt_path}")
-                
-            except Exception as e:
-                logger.error(f"Failed to write {image_path.name}.txt: {e}")
+            # Determine output path
+            if output_dir:
+                txt_path = output_dir / f"{image_path.stem}.txt"
+            else:
+                # Save next to image
+                txt_path = image_path.with_suffix('.txt')
+            data = encoded.get(caption)
+            if data is None:
+                data = encoded[caption] = caption.encode('utf-8')
+            pairs[txt_path] = data
+        
+        # Many small independent files: overlap the open/write/close syscalls
+        max_workers = max(1, min(32, (os.cpu_count() or 1) * 4, len(pairs)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export") as executor:
+            count = sum(executor.map(self._write_caption_file, pairs.items()))
         
         logger.info(f"Exported {count} individual .txt files")
         return count
     
+    @staticmethod
+    def _write_caption_file(pair) -> bool:
+        """Write one (txt_path, utf8_bytes) pair; returns True on success."""
+        txt_path, data = pair
+        try:
+            txt_path.write_bytes(data)
+            logger.debug(f"Wrote caption to {txt_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write {txt_path.name}: {e}")
+            return False
+    
     def export_csv(self, results: List[Dict[str, Any]], output_path: Path, relative_to: Optional[Path] = None) -> bool:
         """
         Export captions as CSV file.
@@ -78,7 +114,7 @@ class CaptionExporter:
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            with open(output_path, 'w', newline='', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as f:
                 fieldnames = [
                     'filepath',
                     'filename',
@@ -87,8 +123,16 @@ class CaptionExporter:
                     'success'
                 ]
                 
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
+                # Plain writer with tuples in column order; DictWriter maps
+                # every row through the field names
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                
+                # All rows share one export timestamp
+                timestamp = datetime.now().isoformat()
+                
+                # Relative paths via a string prefix check, skipping pathlib per row
+                prefix = os.path.join(str(relative_to), '') if relative_to else None
                 
                 for result in results:
                     image_path = result.get('path')
@@ -98,27 +142,17 @@ class CaptionExporter:
                     if not image_path:
                         continue
                     
-                    # Format path
+                    # Format path (absolute when outside relative_to)
                     filepath = str(image_path)
-                    if relative_to:
-                        try:
-                            # is_relative_to available in Python 3.9+
-                            if image_path.is_relative_to(relative_to):
-                                filepath = str(image_path.relative_to(relative_to))
-                        except (ValueError, AttributeError):
-                            # Fallback for Python < 3.9
-                            try:
-                                filepath = str(image_path.relative_to(relative_to))
-                            except ValueError:
-                                filepath = str(image_path)
+                    if prefix and filepath.startswith(prefix):
+                        filepath = filepath[len(prefix):]
                     
-                    writer.writerow({
-                        'filepath': filepath,
-                        'filename': image_path.name,
-                        'caption': caption,
-                        'timestamp': datetime.now().isoformat(),
-                        'success': success
-                    })
+                    # Fast path: fields with nothing to quote are joined by hand
+                    # (the filename is part of filepath, the rest are plain values)
+                    if _CSV_NEEDS_QUOTING.search(caption) or _CSV_NEEDS_QUOTING.search(filepath):
+                        writer.writerow((filepath, image_path.name, caption, timestamp, success))
+                    else:
+                        f.write(f"{filepath},{image_path.name},{caption},{timestamp},{success}\r\n")
             
             logger.info(f"Exported CSV to {output_path}")
             return True
@@ -143,37 +177,42 @@ class CaptionExporter:
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Build JSON structure
-            output_data = {
-                'metadata': metadata or {},
-                'generated_at': datetime.now().isoformat(),
-                'total_images': len(results),
-                'results': []
-            }
+            # Default metadata
+            metadata = dict(metadata or {})
+            metadata.setdefault('version', '1.0')
             
-            # Add default metadata
-            if 'version' not in output_data['metadata']:
-                output_data['metadata']['version'] = '1.0'
-            
-            # Convert results
-            for result in results:
-                image_path = result.get('path')
-                caption = result.get('caption', '')
-                success = result.get('success', True)
+            # Stream the document: the header is written by hand and each
+            # result is serialized and written on its own, so memory stays
+            # O(1 record) instead of holding the whole output structure
+            with open(output_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+                f.write(b'{\n  "metadata": ')
+                f.write(_json_bytes(metadata, indent=True).replace(b'\n', b'\n  '))
+                f.write(b',\n  "generated_at": ')
+                f.write(_json_bytes(datetime.now().isoformat()))
+                f.write(b',\n  "total_images": ')
+                f.write(str(len(results)).encode('ascii'))
+                f.write(b',\n  "results": [')
                 
-                if not image_path:
-                    continue
+                written = 0
+                for result in results:
+                    image_path = result.get('path')
+                    caption = result.get('caption', '')
+                    success = result.get('success', True)
+                    
+                    if not image_path:
+                        continue
+                    
+                    f.write(b',\n    ' if written else b'\n    ')
+                    filepath = str(image_path)
+                    f.write(_json_bytes({
+                        'filepath': filepath,
+                        'filename': os.path.basename(filepath),
+                        'caption': caption,
+                        'success': success
+                    }))
+                    written += 1
                 
-                output_data['results'].append({
-                    'filepath': str(image_path),
-                    'filename': image_path.name,
-                    'caption': caption,
-                    'success': success
-                })
-            
-            # Write JSON
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+                f.write(b'\n  ]\n}' if written else b']\n}')
             
             logger.info(f"Exported JSON to {output_path}")
             return True
@@ -197,21 +236,15 @@ class CaptionExporter:
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                for idx, result in enumerate(results):
-                    image_path = result.get('path')
-                    caption = result.get('caption', '')
-                    
-                    if not image_path or not caption:
-                        continue
-                    
-                    # Format: filename on separate line, caption below, blank line separator
-                    f.write(f"{image_path.name}\n")
-                    f.write(f"{caption}\n")
-                    
-                    # Add blank line between entries (except after last one)
-                    if idx < len(results) - 1:
-                        f.write("\n")
+            with open(output_path, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as f:
+                # Format: filename on separate line, caption below, blank line
+                # between entries; built in memory and written once
+                entries = [
+                    f"{result['path'].name}\n{result['caption']}\n"
+                    for result in results
+                    if result.get('path') and result.get('caption')
+                ]
+                f.write("\n".join(entries))
             
             logger.info(f"Exported batch text file to {output_path}")
             return True
@@ -234,24 +267,26 @@ class CaptionExporter:
             Dictionary mapping format names to success status
         """
         export_status = {}
+        parent = base_output_path.parent
+        stem = base_output_path.stem
         
         for fmt in formats:
             try:
                 if fmt == 'txt_individual':
                     # Export to same directory as base_output_path
-                    count = self.export_individual_txt(results, base_output_path.parent)
+                    count = self.export_individual_txt(results, parent)
                     export_status[fmt] = count > 0
                     
                 elif fmt == 'csv':
-                    csv_path = base_output_path.parent / f"{base_output_path.stem}_captions.csv"
-                    export_status[fmt] = self.export_csv(results, csv_path, relative_to=base_output_path.parent)
+                    csv_path = parent / f"{stem}_captions.csv"
+                    export_status[fmt] = self.export_csv(results, csv_path, relative_to=parent)
                     
                 elif fmt == 'json':
-                    json_path = base_output_path.parent / f"{base_output_path.stem}_captions.json"
+                    json_path = parent / f"{stem}_captions.json"
                     export_status[fmt] = self.export_json(results, json_path, metadata)
                     
                 elif fmt == 'txt_batch':
-                    txt_path = base_output_path.parent / f"{base_output_path.stem}_captions.txt"
+                    txt_path = parent / f"{stem}_captions.txt"
                     export_status[fmt] = self.export_txt_batch(results, txt_path)
                     
                 else:
@@ -0,0 +1,565 @@
+"""Image validation and directory scanning."""
+
+import io
+import os
+import mmap
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple, Dict, Any, Optional, Union, Literal, ClassVar, FrozenSet
+from PIL import Image
+import logging
+
+from imagecaptioner.utils.image_io import decode_jpeg_rgb, load_rgb
+from imagecaptioner.utils.validators import JPEG_EXTENSIONS, SUPPORTED_FORMATS, has_supported_extension
+
+logger = logging.getLogger(__name__)
+
+ResizeMethod = Literal["lanczos", "bilinear", "bicubic"]
+
+# Resize method names (lowercase) to Pillow resampling filters
+_RESAMPLE: Dict[str, Image.Resampling] = {
+    "lanczos": Image.Resampling.LANCZOS,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+}
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    """Header information for one image file (error is set if it couldn't be read)."""
+    
+    # Declared by hand rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("path", "name", "format", "mode", "width", "height", "error")
+    
+    path: str
+    name: str
+    format: Optional[str]
+    mode: Optional[str]
+    width: int
+    height: int
+    error: Optional[str]
+    
+    # Slots without a __dict__ plus frozen=True would make copy/pickle restore
+    # state through the blocked __setattr__, so state is handled explicitly
+    def __getstate__(self) -> Tuple[Any, ...]:
+        """Field values in __slots__ order, for copy and pickle."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state: Tuple[Any, ...]):
+        """Restore fields saved by __getstate__, bypassing the frozen __setattr__."""
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) tuple."""
+        return self.width, self.height
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary form previously returned by get_image_info()."""
+        if self.error is not None:
+            return {"path": self.path, "name": self.name, "error": self.error}
+        return {
+            "path": self.path,
+            "name": self.name,
+            "format": self.format,
+            "mode": self.mode,
+            "size": self.size,
+            "width": self.width,
+            "height": self.height,
+        }
+
+
+class ImageProcessor:
+    """Handle image scanning, validation, and loading."""
+    
+    # Shared by all instances; nothing is set up per instance
+    supported_formats: ClassVar[FrozenSet[str]] = SUPPORTED_FORMATS
+    
+    def scan_directory(self, directory: Path, recursive: bool = False) -> List[Path]:
+        """
+        Scan directory for supported image files.
+        
+        Args:
+            directory: Path to directory to scan
+            recursive: Whether to scan subdirectories
+            
+        Returns:
+            List of image file paths
+        """
+        return self._scan(directory, recursive, with_sizes=False)
+    
+    def scan_directory_with_sizes(self, directory: Path, recursive: bool = False) -> List[Tuple[Path, int]]:
+        """
+        Scan directory for supported image files, along with their sizes.
+        
+        Non-recursive scans read sizes from DirEntry.stat(), which on Windows
+        comes with the directory listing; recursive scans stat() each accepted
+        file once. Passing the sizes on as prepare_image_for_inference(file_size=...)
+        saves a stat() per image later. Files whose size can't be read are skipped.
+        
+        Args:
+            directory: Path to directory to scan
+            recursive: Whether to scan subdirectories
+            
+        Returns:
+            List of (image_path, size_in_bytes) tuples, sorted by path
+        """
+        return self._scan(directory, recursive, with_sizes=True)
+    
+    def _scan(self, directory: Path, recursive: bool, with_sizes: bool) -> list:
+        """Shared scan loop: sorted paths, or (path, size) tuples if with_sizes."""
+        images = []
+        
+        def add(image_path: Path, stat) -> None:
+            if not with_sizes:
+                images.append(image_path)
+                return
+            try:
+                images.append((image_path, stat().st_size))
+            except OSError as e:
+                logger.warning(f"Skipping {image_path.name}: {e}")
+        
+        try:
+            if recursive:
+                # Recursive scan: os.walk visits each directory once (scandir
+                # underneath, no symlinked directories) and only names are
+                # checked, so filtered-out files are never stat()ed
+                for root, _, files in os.walk(directory, onerror=self._log_walk_error):
+                    root_path = Path(root)
+                    for name in files:
+                        if has_supported_extension(name):
+                            image_path = root_path / name
+                            add(image_path, image_path.stat)
+            else:
+                # Non-recursive scan (only top-level)
+                # Cheap name check first; DirEntry.is_file() uses the type
+                # cached by scandir, so only candidates can cost a stat
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if has_supported_extension(entry.name) and entry.is_file():
+                            add(Path(entry.path), entry.stat)
+            
+            # Both os.walk and scandir yield each path exactly once, so no
+            # dedup pass: sort the list in place
+            images.sort()
+            
+            logger.info(f"Found {len(images)} images in {directory}")
+            return images
+            
+        except PermissionError as e:
+            logger.error(f"Permission denied accessing {directory}: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"Error scanning directory {directory}: {e}")
+            return []
+    
+    @staticmethod
+    def _log_walk_error(error: OSError):
+        """Skip unreadable subdirectories during a recursive scan."""
+        logger.warning(f"Skipping unreadable directory: {error}")
+    
+    def validate_image(self, image_path: Path) -> Tuple[bool, str]:
+        """
+        Validate that an image file is readable and not corrupted.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        error = self._check_file(image_path)
+        if error:
+            return False, error
+        
+        # Try to open and fully decode the image; a complete load catches
+        # truncated and corrupted data without a separate verify() pass
+        try:
+            with Image.open(image_path) as img:
+                img.load()
+            
+            return True, "OK"
+            
+        except Exception as e:
+            return False, f"Corrupted or invalid image: {str(e)}"
+    
+    def validate_image_fast(self, image_path: Path) -> Tuple[bool, str]:
+        """
+        Check that Pillow can parse an image's headers, without decoding it.
+        
+        Much cheaper than validate_image() but does not catch truncated or
+        corrupted pixel data; use it for quick pre-filtering. The file is
+        memory-mapped, so only the pages Pillow's parser touches are read.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        error = self._check_file(image_path)
+        if error:
+            return False, error
+        
+        try:
+            self._verify_mapped(image_path)
+            return True, "OK"
+        except Exception:
+            # Empty files can't be mapped, and mmap refuses seeks past the end
+            # that some plugins probe with; retry through a regular file so
+            # failures are judged (and reported) as before
+            pass
+        
+        try:
+            with Image.open(image_path) as img:
+                img.verify()
+            
+            return True, "OK"
+            
+        except Exception as e:
+            return False, f"Corrupted or invalid image: {str(e)}"
+    
+    @staticmethod
+    def _verify_mapped(image_path: Path):
+        """Run Pillow's verify() on a read-only memory map of the file; raises on failure."""
+        with open(image_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with Image.open(mapped) as img:
+                img.verify()
+    
+    def _check_file(self, image_path: Path) -> Optional[str]:
+        """Return an error message if image_path isn't an existing file of a supported format."""
+        # Check extension
+        if image_path.suffix.lower() not in self.supported_formats:
+            return f"Unsupported format: {image_path.suffix}"
+        
+        # Check file exists
+        if not image_path.exists():
+            return "File not found"
+        
+        # Check file is readable
+        if not image_path.is_file():
+            return "Not a file"
+        
+        return None
+    
+    def validate_images_parallel(
+        self,
+        image_paths: List[Path],
+        max_workers: Optional[int] = None,
+        chunksize: int = 32,
+        fast: bool = False
+    ) -> List[Tuple[Path, bool, str]]:
+        """
+        Validate several images concurrently.
+        
+        Validation is I/O bound and PIL releases the GIL while decoding, so a
+        thread pool scales with disk parallelism. Paths are handed to the
+        threads in chunks to keep per-task overhead low.
+        
+        Args:
+            image_paths: Paths to image files
+            max_workers: Thread count (default: min(32, 2 x CPU count))
+            chunksize: Number of paths each task validates
+            fast: Check headers only with validate_image_fast() instead of a
+                full decode with validate_image()
+            
+        Returns:
+            (image_path, is_valid, error_message) tuples in input order
+        """
+        if not image_paths:
+            return []
+        
+        validate = self.validate_image_fast if fast else self.validate_image
+        
+        def validate_chunk(chunk: List[Path]) -> List[Tuple[Path, bool, str]]:
+            return [(path, *validate(path)) for path in chunk]
+        
+        chunksize = max(1, chunksize)
+        chunks = [image_paths[i:i + chunksize] for i in range(0, len(image_paths), chunksize)]
+        max_workers = min(max_workers or min(32, (os.cpu_count() or 4) * 2), len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="validate") as executor:
+            return [result for chunk in executor.map(validate_chunk, chunks) for result in chunk]
+    
+    def load_image(self, image_path: Path) -> Image.Image:
+        """
+        Load and return an image.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            PIL Image object
+            
+        Raises:
+            Exception if image cannot be loaded
+        """
+        try:
+            return load_rgb(image_path)
+        except Exception as e:
+            logger.error(f"Failed to load image {image_path}: {e}")
+            raise
+    
+    def get_image_info(self, image_path: Path) -> ImageInfo:
+        """
+        Get information about an image file.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            ImageInfo for the file (use .to_dict() for a dictionary)
+        """
+        path_str = str(image_path)
+        name = image_path.name
+        try:
+            with Image.open(image_path) as img:
+                return ImageInfo(path_str, name, img.format, img.mode, img.width, img.height, None)
+        except Exception as e:
+            logger.error(f"Failed to get info for {image_path}: {e}")
+            return ImageInfo(path_str, name, None, None, 0, 0, str(e))
+
+    def prepare_image_for_inference(
+        self,
+        image_path: Path,
+        processing_config: Dict[str, Any],
+        export_dir: Optional[Path] = None,
+        file_size: Optional[int] = None
+    ) -> Tuple[Image.Image, Dict[str, Any]]:
+        """
+        Load and preprocess an image for inference, with optional resize caching.
+        
+        Args:
+            image_path: Path to image file
+            processing_config: Processing configuration (resize settings)
+            export_dir: Optional export directory for cached resized images
+            file_size: Size of the file in bytes if already known (e.g. from
+                scan_directory_with_sizes()); stat()ed otherwise
+        
+        Returns:
+            Tuple of (processed_image, metadata)
+        """
+        # File metadata
+        if file_size is None:
+            file_size = image_path.stat().st_size
+
+        resize_enabled = processing_config.get("resize_before_inference", True)
+        max_dimension = processing_config.get("max_dimension", 1024)
+        cache_resized = processing_config.get("cache_resized_images", False)
+
+        # Leaving the with block closes the file (also for the turbojpeg path and
+        # multi-frame files, which load() leaves open) but keeps decoded pixels,
+        # so the loaded image is used directly instead of a copy
+        with Image.open(image_path) as img:
+            original_width, original_height = img.size
+            img_format = img.format or 'Unknown'
+
+            # Decode once; only the header has been read so far
+            source_img = None
+            if img.format == "JPEG":
+                if resize_enabled and max(original_width, original_height) > max_dimension:
+                    # Let libjpeg decode at 1/2, 1/4 or 1/8 scale (DCT scaling);
+                    # draft() never goes below the requested size
+                    img.draft("RGB", self._fit_within(original_width, original_height, max_dimension))
+                else:
+                    # Full-size decode, with libjpeg-turbo when available
+                    source_img = decode_jpeg_rgb(image_path.read_bytes())
+            if source_img is None:
+                img.load()
+                source_img = img
+
+        original_dimensions = f"{original_width}x{original_height}"
+        processed_img = source_img
+        resized_dimensions = original_dimensions
+
+        # Apply resize for inference if enabled (smart resize - downscale only)
+        if resize_enabled:
+            processed_img, _ = self.resize_image_smart(
+                processed_img,
+                max_dimension,
+                method="lanczos",
+                allow_upscale=False
+            )
+
+        # Compared with the header size, since draft() may already have shrunk the image
+        was_resized = processed_img.size != (original_width, original_height)
+        if was_resized:
+            new_width, new_height = processed_img.size
+            resized_dimensions = f"{new_width}x{new_height}"
+            logger.debug("Resized %s: %s → %s", image_path.name, original_dimensions, resized_dimensions)
+
+        # Cache resized image if option enabled (always resize to target dimension)
+        if cache_resized and export_dir is not None:
+            cache_format = processing_config.get("cache_format", "original")
+            jpeg_quality = processing_config.get("jpeg_quality", 95)
+
+            # Always resize cached images to target dimension (allow upscale),
+            # from the same decoded source
+            cache_img, _ = self.resize_image_smart(
+                source_img,
+                max_dimension,
+                method="lanczos",
+                allow_upscale=True
+            )
+
+            self.save_resized_image(
+                cache_img,
+                image_path,
+                export_dir,
+                cache_format=cache_format,
+                jpeg_quality=jpeg_quality,
+                original_size=file_size
+            )
+
+        if was_resized:
+            dimensions_display = f"{original_dimensions}→{resized_dimensions}"
+        else:
+            dimensions_display = original_dimensions
+
+        metadata = {
+            "file_size": file_size,
+            "dimensions": dimensions_display,
+            "img_format": img_format
+        }
+
+        return processed_img, metadata
+    
+    @staticmethod
+    def resize_image_smart(
+        image: Union[Image.Image, Path],
+        max_dimension: int,
+        method: ResizeMethod = "lanczos",
+        allow_upscale: bool = False
+    ) -> Tuple[Image.Image, bool]:
+        """
+        Smart resize - downsize if image exceeds max dimension, optionally upscale smaller images.
+        
+        Args:
+            image: PIL Image to resize, or a path to load it from. JPEG paths are
+                decoded with DCT scaling to no less than twice the target first.
+            max_dimension: Target maximum width or height
+            method: Resize method, lowercase (lanczos, bilinear, bicubic)
+            allow_upscale: If True, upscale images smaller than max_dimension
+            
+        Returns:
+            Tuple of (resized_image, was_resized)
+        """
+        if isinstance(image, Path):
+            image = ImageProcessor._load_drafted(image, max_dimension * 2)
+        
+        width, height = image.size
+        max_current = max(width, height)
+        
+        # Only resize if exceeds threshold or upscaling is allowed
+        if max_current == max_dimension:
+            return image, False
+        if not allow_upscale and max_current < max_dimension:
+            return image, False
+        
+        # Calculate new dimensions maintaining aspect ratio
+        new_width, new_height = ImageProcessor._fit_within(width, height, max_dimension)
+        
+        # Select resize method
+        resample = _RESAMPLE.get(method, Image.Resampling.LANCZOS)
+        
+        if max_current < max_dimension:
+            action = "Upscaled"
+            resized = image.resize((new_width, new_height), resample)
+        else:
+            # reducing_gap=2.0: Pillow first runs reduce() (integer box filter)
+            # by scale // 2, keeping the intermediate at least twice the target,
+            # then the selected filter on the smaller image (as thumbnail() does,
+            # without modifying the caller's image in place). A full
+            # reduce(int(scale)) would leave Lanczos almost nothing to filter.
+            action = "Downscaled"
+            resized = image.resize((new_width, new_height), resample, reducing_gap=2.0)
+        # Lazy %-formatting: skipped entirely unless DEBUG is enabled
+        logger.debug("%s image from %dx%d to %dx%d", action, width, height, new_width, new_height)
+        return resized, True
+    
+    @staticmethod
+    def _load_drafted(image_path: Path, draft_dimension: int) -> Image.Image:
+        """Load an image, letting JPEG decoding shrink it to no less than draft_dimension."""
+        # Leaving the with block closes the file but keeps the loaded pixels
+        with Image.open(image_path) as img:
+            if image_path.suffix.lower() in JPEG_EXTENSIONS:
+                img.draft("RGB", (draft_dimension, draft_dimension))
+            img.load()
+        return img
+    
+    @staticmethod
+    def _fit_within(width: int, height: int, max_dimension: int) -> Tuple[int, int]:
+        """Scale (width, height) so the longer side equals max_dimension, keeping aspect ratio."""
+        # Integer floor division: exact, and no float round-trip
+        if width > height:
+            return max_dimension, height * max_dimension // width
+        return width * max_dimension // height, max_dimension
+    
+    @staticmethod
+    def save_resized_image(
+        image: Image.Image,
+        original_path: Path,
+        output_dir: Path,
+        cache_format: str = "original",
+        jpeg_quality: int = 95,
+        original_size: Optional[int] = None
+    ) -> Tuple[Path, int, int]:
+        """
+        Save resized image to cache directory.
+        
+        Args:
+            image: PIL Image to save
+            original_path: Original image path
+            output_dir: Directory to save resized images
+            cache_format: Format to save ("original", "png", "jpeg")
+            jpeg_quality: JPEG quality (1-100)
+            original_size: Size of the original file in bytes, if already known
+            
+        Returns:
+            Tuple of (saved_path, original_size_bytes, saved_size_bytes)
+        """
+        # Create resized_images subdirectory
+        resized_dir = output_dir / "resized_images"
+        resized_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Determine format and extension
+        if cache_format == "jpeg":
+            save_format = "JPEG"
+            new_extension = ".jpg"
+            # JPEG doesn't support transparency, ensure RGB
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGB")
+        elif cache_format == "png":
+            save_format = "PNG"
+            new_extension = ".png"
+        else:  # "original"
+            save_format = image.format if hasattr(image, 'format') and image.format else 'PNG'
+            new_extension = original_path.suffix  # Keep original extension
+        
+        # Create output path with correct extension
+        output_filename = original_path.stem + new_extension
+        output_path = resized_dir / output_filename
+        
+        # Original size is the source file on disk; no throwaway re-encode
+        if original_size is None:
+            original_size = original_path.stat().st_size
+        
+        # Save with format-specific options
+        save_kwargs = {}
+        if save_format == "JPEG":
+            save_kwargs = {"quality": jpeg_quality, "optimize": True}
+        elif save_format == "PNG":
+            save_kwargs = {"optimize": True}
+        
+        # Encode in memory and write once; the size comes from the buffer
+        # instead of a stat() after writing
+        buffer = io.BytesIO()
+        image.save(buffer, format=save_format, **save_kwargs)
+        data = buffer.getbuffer()
+        output_path.write_bytes(data)
+        saved_size = len(data)
+        
+        logger.info(f"Cached {original_path.name} → {output_filename}: {original_size/1024:.1f}KB → {saved_size/1024:.1f}KB ({save_format})")
+        return output_path, original_size, saved_size
+
@@ -0,0 +1,382 @@
+"""Resident caption server that keeps the model loaded between CLI invocations."""
+
+import os
+import sys
+import time
+import secrets
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from multiprocessing.connection import Listener, Client, Connection, answer_challenge, deliver_challenge
+
+from imagecaptioner.config.app_config import get_config
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = Path.home() / ".cache" / "imagecaptioner"
+AUTHKEY_FILE = STATE_DIR / "authkey"
+LOCK_FILE = STATE_DIR / "server.lock"
+
+if os.name == "nt":
+    DEFAULT_ADDRESS = r"\\.\pipe\imagecaptioner"
+    ADDRESS_FAMILY = "AF_PIPE"
+else:
+    DEFAULT_ADDRESS = str(STATE_DIR / "sock")
+    ADDRESS_FAMILY = "AF_UNIX"
+
+DEFAULT_IDLE_TIMEOUT = 15 * 60  # Seconds without requests before the model is unloaded
+REQUEST_TIMEOUT = 10.0  # Seconds an authenticated client has to send its request
+
+
+def _get_authkey() -> bytes:
+    """
+    Read (or create) the shared secret used to authenticate connections.
+
+    Requests are pickled, so only processes that can read this user-private
+    file may talk to the server.
+
+    A client autostarting the server calls this at nearly the same time as
+    the server itself, so the key is written to a temp file and moved into
+    place whole; readers never see a partial key, and the first key to land
+    is the one both sides use.
+    """
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    if not AUTHKEY_FILE.exists():
+        tmp_file = STATE_DIR / f"authkey.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(str(tmp_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(secrets.token_bytes(32))
+        try:
+            # link() fails if another process already installed a key, so an
+            # existing key is never replaced under a running server
+            os.link(tmp_file, AUTHKEY_FILE)
+        except FileExistsError:
+            pass
+        except OSError:
+            # No hard links on this filesystem: still atomic, but last writer wins
+            if not AUTHKEY_FILE.exists():
+                os.replace(tmp_file, AUTHKEY_FILE)
+        finally:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+
+    authkey = AUTHKEY_FILE.read_bytes()
+    if not authkey:
+        raise RuntimeError(f"Caption server key file {AUTHKEY_FILE} is empty; delete it and retry")
+    return authkey
+
+
+class CaptionServer:
+    """Serve caption requests from a single resident LLaVA model."""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        Initialize the server.
+
+        Args:
+            address: Unix socket path or Windows named pipe to listen on
+            idle_timeout: Seconds without requests before the model is unloaded
+                (it is reloaded on the next request); 0 disables auto-unload
+        """
+        self.address = address
+        self.idle_timeout = idle_timeout
+        self.config = get_config()
+        self.model = None
+        self._lock = threading.Lock()
+        self._last_used = time.monotonic()
+        self._running = False
+
+    def serve_forever(self):
+        """Accept connections until a shutdown request arrives."""
+        lock_fd = self._acquire_lock()
+        if lock_fd is None:
+            logger.info("Caption server already running")
+            return
+
+        try:
+            if ADDRESS_FAMILY == "AF_UNIX" and os.path.exists(self.address):
+                # Left over from a server that didn't shut down cleanly (we hold the lock)
+                os.unlink(self.address)
+
+            authkey = _get_authkey()
+            # No authkey on the Listener: its handshake would run inside accept()
+            # and a client that connects but never answers would block the loop.
+            # Each connection is authenticated on its own thread instead.
+            with Listener(self.address, family=ADDRESS_FAMILY) as listener:
+                logger.info(f"Caption server listening on {self.address}")
+                self._running = True
+                if self.idle_timeout:
+                    threading.Thread(target=self._idle_watchdog, daemon=True).start()
+
+                while self._running:
+                    try:
+                        conn = listener.accept()
+                    except Exception as e:
+                        logger.warning(f"Rejected connection: {e}")
+                        continue
+
+                    if not self._running:
+                        # Wake-up connection from a shutdown request
+                        conn.close()
+                        break
+
+                    threading.Thread(
+                        target=self._serve_connection, args=(conn, authkey), daemon=True
+                    ).start()
+        finally:
+            self._running = False
+            self._unload()
+            os.close(lock_fd)
+            try:
+                LOCK_FILE.unlink()
+            except OSError:
+                pass
+            logger.info("Caption server stopped")
+
+    def _serve_connection(self, conn: Connection, authkey: bytes):
+        """Authenticate one client, then answer its single request."""
+        with conn:
+            try:
+                # Same challenge/response as Listener(authkey=...), server side
+                deliver_challenge(conn, authkey)
+                answer_challenge(conn, authkey)
+
+                if not conn.poll(REQUEST_TIMEOUT):
+                    logger.warning(f"No request within {REQUEST_TIMEOUT:.0f}s, dropping connection")
+                    return
+                conn.send(self._handle(conn.recv()))
+            except (EOFError, OSError) as e:
+                logger.warning(f"Client disconnected: {e}")
+                return
+            except Exception as e:
+                # Failed authentication or an unpicklable request
+                logger.warning(f"Rejected connection: {e}")
+                return
+
+        if not self._running:
+            self._wake_listener()
+
+    def _wake_listener(self):
+        """Unblock the accept() loop after a shutdown request."""
+        try:
+            Client(self.address, family=ADDRESS_FAMILY).close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _validate_request(request: Any) -> Optional[str]:
+        """Return an error message if request isn't a well-formed request dict."""
+        if not isinstance(request, dict):
+            return f"Malformed request: expected a dict, got {type(request).__name__}"
+        op = request.get("op")
+        if op in ("ping", "shutdown"):
+            return None
+        if op != "caption":
+            return f"Unknown request: {op}"
+
+        image_paths = request.get("image_paths")
+        if not isinstance(image_paths, (list, tuple)) or not all(isinstance(p, str) for p in image_paths):
+            return "Malformed caption request: 'image_paths' must be a list of strings"
+        prompt = request.get("prompt")
+        if prompt is not None and not isinstance(prompt, str):
+            return "Malformed caption request: 'prompt' must be a string or None"
+        gen_kwargs = request.get("gen_kwargs", {})
+        if not isinstance(gen_kwargs, dict) or not all(isinstance(k, str) for k in gen_kwargs):
+            return "Malformed caption request: 'gen_kwargs' must be a dict with string keys"
+        return None
+
+    def _handle(self, request: Any) -> Dict[str, Any]:
+        """Dispatch one request and build its response."""
+        error = self._validate_request(request)
+        if error:
+            return {"ok": False, "error": error}
+
+        op = request["op"]
+        if op == "ping":
+            return {"ok": True}
+        if op == "shutdown":
+            self._running = False
+            return {"ok": True}
+
+        with self._lock:
+            self._last_used = time.monotonic()
+            try:
+                model = self._ensure_model()
+                inference_config = {**self.config.get("inference", {}), **request.get("gen_kwargs", {})}
+                inference_config.pop("trigger_word", None)
+                prompt = request.get("prompt") or "Describe this image in detail:"
+
+                captions = []
+                for image_path in request["image_paths"]:
+                    try:
+                        captions.append((image_path, model.generate_caption(
+                            prompt=prompt,
+                            image_path=image_path,
+                            **inference_config
+                        ), None))
+                    except Exception as e:
+                        captions.append((image_path, None, str(e)))
+                return {"ok": True, "captions": captions}
+            except Exception as e:
+                logger.exception("Caption request failed")
+                return {"ok": False, "error": str(e)}
+            finally:
+                self._last_used = time.monotonic()
+
+    def _ensure_model(self):
+        """Load the model on first use (or after an idle unload)."""
+        if self.model is None or not self.model.is_loaded():
+            from imagecaptioner.models.llava import LLaVAModel
+
+            model_config = self.config.get("model", {})
+            logger.info("Loading model for caption server...")
+            self.model = LLaVAModel(
+                model_name=model_config.get("name", "llava-hf/llava-1.5-7b-hf"),
+                device=model_config.get("device", "auto"),
+                quantization=model_config.get("quantization", "auto"),
+                kv_cache_bits=model_config.get("kv_cache_bits"),
+                compile_model=model_config.get("compile", False)
+            )
+            self.model.load()
+        return self.model
+
+    def _idle_watchdog(self):
+        """Unload the model after idle_timeout seconds without requests."""
+        while self._running:
+            time.sleep(min(30.0, self.idle_timeout))
+            with self._lock:
+                if self.model is not None and time.monotonic() - self._last_used >= self.idle_timeout:
+                    logger.info(f"Idle for {self.idle_timeout:.0f}s, unloading model")
+                    self._unload()
+
+    def _unload(self):
+        """Free the model, if loaded."""
+        if self.model is not None:
+            try:
+                self.model.unload()
+            except Exception as e:
+                logger.error(f"Error unloading model: {e}")
+            self.model = None
+
+    @staticmethod
+    def _acquire_lock() -> Optional[int]:
+        """Create the lockfile exclusively, or return None if a live server holds it."""
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(str(LOCK_FILE), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                os.write(fd, str(os.getpid()).encode())
+                return fd
+            except FileExistsError:
+                if is_server_running():
+                    return None
+                try:
+                    if time.time() - LOCK_FILE.stat().st_mtime < 10:
+                        # Another server is still starting up
+                        return None
+                except OSError:
+                    continue
+                # Stale lock from a crashed server
+                try:
+                    LOCK_FILE.unlink()
+                except OSError:
+                    return None
+        return None
+
+
+def _request(request: Dict[str, Any], address: str = DEFAULT_ADDRESS) -> Dict[str, Any]:
+    """Send one request to the server and return its response."""
+    with Client(address, family=ADDRESS_FAMILY, authkey=_get_authkey()) as conn:
+        conn.send(request)
+        return conn.recv()
+
+
+def is_server_running(address: str = DEFAULT_ADDRESS) -> bool:
+    """Check whether a caption server is answering on address."""
+    try:
+        return _request({"op": "ping"}, address).get("ok", False)
+    except Exception:
+        return False
+
+
+def start_server(idle_timeout: float = DEFAULT_IDLE_TIMEOUT, wait: float = 30.0) -> bool:
+    """
+    Start a detached caption server process.
+
+    Args:
+        idle_timeout: Seconds without requests before the server unloads the model
+        wait: Seconds to wait for the server to start answering
+
+    Returns:
+        True once the server answers pings
+    """
+    cmd = [sys.executable, "-m", "imagecaptioner.main", "--serve", "--idle-timeout", str(idle_timeout)]
+
+    # Make the package importable in the child when running from a source checkout
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+    kwargs: Dict[str, Any] = {
+        "stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "env": env
+    }
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(cmd, **kwargs)
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_server_running():
+            return True
+        time.sleep(0.25)
+    return False
+
+
+def caption_images(
+    image_paths: List[str],
+    prompt: Optional[str] = None,
+    gen_kwargs: Optional[Dict[str, Any]] = None,
+    autostart: bool = True
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Caption images using the resident server, starting it if needed.
+
+    Args:
+        image_paths: Image files to caption
+        prompt: Prompt text (server default if None)
+        gen_kwargs: Generation parameter overrides
+        autostart: Start a server in the background when none is running
+
+    Returns:
+        List of (image_path, caption, error) tuples; exactly one of caption/error is set
+    """
+    if not is_server_running():
+        if not autostart:
+            raise RuntimeError("Caption server is not running (start it with --serve)")
+        logger.info("Starting caption server...")
+        if not start_server():
+            raise RuntimeError("Caption server failed to start")
+
+    response = _request({
+        "op": "caption",
+        "image_paths": [str(Path(p).resolve()) for p in image_paths],
+        "prompt": prompt,
+        "gen_kwargs": gen_kwargs or {},
+    })
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "Unknown server error"))
+    return response["captions"]
+
+
+def stop_server() -> bool:
+    """Ask a running caption server to shut down."""
+    try:
+        return _request({"op": "shutdown"}).get("ok", False)
+    except Exception:
+        return False
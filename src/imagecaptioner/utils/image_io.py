@@ -0,0 +1,70 @@
+"""Fast image decoding helpers."""
+
+from pathlib import Path
+from typing import Optional, Union
+from PIL import Image
+import logging
+
+from imagecaptioner.utils.validators import JPEG_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+_turbojpeg = None
+_turbojpeg_checked = False
+
+
+def _get_turbojpeg():
+    """Return a shared TurboJPEG decoder, or None if PyTurboJPEG/libjpeg-turbo is missing."""
+    global _turbojpeg, _turbojpeg_checked
+    if not _turbojpeg_checked:
+        _turbojpeg_checked = True
+        try:
+            from turbojpeg import TurboJPEG
+            _turbojpeg = TurboJPEG()
+            logger.info("Using libjpeg-turbo for JPEG decoding")
+        except Exception as e:
+            logger.debug(f"PyTurboJPEG unavailable, using PIL for JPEG decoding: {e}")
+    return _turbojpeg
+
+
+def decode_jpeg_rgb(data: bytes) -> Optional[Image.Image]:
+    """
+    Decode JPEG bytes to an RGB image with libjpeg-turbo.
+
+    Args:
+        data: Encoded JPEG bytes
+
+    Returns:
+        RGB PIL Image, or None if turbojpeg is unavailable or can't decode the data
+        (callers then fall back to PIL)
+    """
+    jpeg = _get_turbojpeg()
+    if jpeg is None:
+        return None
+
+    try:
+        from turbojpeg import TJPF_RGB
+        return Image.fromarray(jpeg.decode(data, pixel_format=TJPF_RGB))
+    except Exception as e:
+        logger.debug(f"turbojpeg decode failed, falling back to PIL: {e}")
+        return None
+
+
+def load_rgb(image_path: Union[str, Path]) -> Image.Image:
+    """
+    Load an image as RGB, using SIMD libjpeg-turbo for JPEGs when available.
+
+    Args:
+        image_path: Path to image file
+
+    Returns:
+        RGB PIL Image
+    """
+    image_path = Path(image_path)
+    if image_path.suffix.lower() in JPEG_EXTENSIONS:
+        image = decode_jpeg_rgb(image_path.read_bytes())
+        if image is not None:
+            return image
+
+    with Image.open(image_path) as img:
+        return img.convert('RGB')
@@ -0,0 +1,159 @@
+"""Input validation utilities."""
+
+import re
+from pathlib import Path
+from typing import Dict, Tuple, FrozenSet, Union
+
+
+# Supported image extensions, lowercase without the dot (immutable: shared by
+# every module that imports it)
+SUPPORTED_EXTS: FrozenSet[str] = frozenset({
+    'jpg', 'jpeg', 'png', 'bmp', 'gif', 'webp', 'tiff', 'tif'
+})
+
+# Dotted form, matching Path.suffix
+SUPPORTED_FORMATS: FrozenSet[str] = frozenset(f".{ext}" for ext in SUPPORTED_EXTS)
+
+# Dotted JPEG extensions: the single "is this a JPEG" check for the TurboJPEG
+# and Image.draft() decode paths
+JPEG_EXTENSIONS: FrozenSet[str] = frozenset({".jpg", ".jpeg"})
+
+# Case-insensitive match of a supported extension at the end of a name
+_SUPPORTED_EXT_RE = re.compile(
+    r"\.(?:%s)\Z" % "|".join(sorted(SUPPORTED_EXTS)),
+    re.IGNORECASE
+)
+
+
+def has_supported_extension(name: str) -> bool:
+    """
+    Check a file name's extension without building a Path.
+    
+    Args:
+        name: File name (or path string)
+        
+    Returns:
+        True if the extension is supported, False otherwise
+    """
+    # One compiled match instead of rfind + slice + lower + set lookup
+    return _SUPPORTED_EXT_RE.search(name) is not None
+
+
+def is_valid_image_format(file_path: Path) -> bool:
+    """
+    Check if file has a supported image format.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        True if format is supported, False otherwise
+    """
+    return has_supported_extension(file_path.name)
+
+
+def validate_directory(dir_path: Path) -> Tuple[bool, str]:
+    """
+    Validate that a directory exists and is readable.
+    
+    Args:
+        dir_path: Path to directory
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not dir_path.exists():
+        return False, "Directory does not exist"
+    
+    if not dir_path.is_dir():
+        return False, "Path is not a directory"
+    
+    try:
+        # Test if directory is readable
+        list(dir_path.iterdir())
+        return True, ""
+    except PermissionError:
+        return False, "Permission denied - cannot read directory"
+    except Exception as e:
+        return False, f"Error accessing directory: {str(e)}"
+
+
+# Shared success result for the range validators
+_VALID_OK: Tuple[bool, str] = (True, "")
+
+# Generation parameter name -> (display name, minimum, maximum), inclusive
+_RANGES: Dict[str, Tuple[str, Union[int, float], Union[int, float]]] = {
+    "temperature": ("Temperature", 0.0, 2.0),
+    "max_tokens": ("Max tokens", 1, 2048),
+    "top_p": ("Top P", 0.0, 1.0),
+    "repetition_penalty": ("Repetition penalty", 1.0, 2.0),
+}
+
+
+def validate_range(name: str, value: Union[int, float]) -> Tuple[bool, str]:
+    """
+    Validate a generation parameter against its allowed range.
+    
+    Args:
+        name: Parameter name (temperature, max_tokens, top_p, repetition_penalty)
+        value: Value to check
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    label, low, high = _RANGES[name]
+    if low <= value <= high:
+        return _VALID_OK
+    return False, f"{label} must be between {low} and {high}"
+
+
+def validate_temperature(value: float) -> Tuple[bool, str]:
+    """
+    Validate temperature parameter.
+    
+    Args:
+        value: Temperature value
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    return validate_range("temperature", value)
+
+
+def validate_max_tokens(value: int) -> Tuple[bool, str]:
+    """
+    Validate max_new_tokens parameter.
+    
+    Args:
+        value: Max tokens value
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    return validate_range("max_tokens", value)
+
+
+def validate_top_p(value: float) -> Tuple[bool, str]:
+    """
+    Validate top_p parameter.
+    
+    Args:
+        value: Top-p value
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    return validate_range("top_p", value)
+
+
+def validate_repetition_penalty(value: float) -> Tuple[bool, str]:
+    """
+    Validate repetition penalty parameter.
+    
+    Args:
+        value: Repetition penalty value
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    return validate_range("repetition_penalty", value)
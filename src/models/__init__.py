@@ -1,7 +0,0 @@
-"""Model implementations for image captioning."""
-
-from .base import VisionLanguageModel
-from .llava import LLaVAModel
-from .downloader import ModelDownloader
-
-__all__ = ["VisionLanguageModel", "LLaVAModel", "ModelDownloader"]
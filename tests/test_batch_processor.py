@@ -0,0 +1,40 @@
+"""Tests for batch preparation."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from imagecaptioner.processing.batch_processor import BatchProcessor
+
+
+class PrepareBatchValidationTests(unittest.TestCase):
+    """Full decode is the default; header-only validation is opt-in."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        Image.effect_noise((256, 256), 50).convert("RGB").save(self.directory / "ok.jpg")
+        data = (self.directory / "ok.jpg").read_bytes()
+        (self.directory / "truncated.jpg").write_bytes(data[:len(data) // 2])
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_default_rejects_truncated_images(self):
+        processor = BatchProcessor()
+        self.assertEqual(processor.prepare_batch(self.directory), [self.directory / "ok.jpg"])
+        errors = processor.get_errors()
+        self.assertEqual([e["path"].name for e in errors], ["truncated.jpg"])
+        self.assertEqual(errors[0]["stage"], "validation")
+
+    def test_fast_validation_only_checks_headers(self):
+        processor = BatchProcessor()
+        valid = processor.prepare_batch(self.directory, fast_validation=True)
+        self.assertEqual([p.name for p in valid], ["ok.jpg", "truncated.jpg"])
+        self.assertEqual(processor.get_errors(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
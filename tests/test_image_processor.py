@@ -0,0 +1,41 @@
+"""Tests for image processing helpers."""
+
+import copy
+import pickle
+import unittest
+
+from imagecaptioner.processing.image_processor import ImageInfo
+
+
+class ImageInfoTests(unittest.TestCase):
+    """ImageInfo must survive copying and pickling despite frozen + __slots__."""
+
+    def setUp(self):
+        self.info = ImageInfo("/images/a.png", "a.png", "PNG", "RGB", 640, 480, None)
+
+    def test_copy(self):
+        self.assertEqual(copy.copy(self.info), self.info)
+
+    def test_deepcopy(self):
+        clone = copy.deepcopy(self.info)
+        self.assertEqual(clone, self.info)
+        self.assertEqual(clone.size, (640, 480))
+
+    def test_pickle_round_trip(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                self.assertEqual(pickle.loads(pickle.dumps(self.info, protocol)), self.info)
+
+    def test_error_info_round_trip(self):
+        info = ImageInfo("/images/b.jpg", "b.jpg", None, None, 0, 0, "cannot identify image file")
+        clone = pickle.loads(pickle.dumps(info))
+        self.assertEqual(clone.to_dict(), info.to_dict())
+
+    def test_still_frozen_after_copy(self):
+        clone = copy.deepcopy(self.info)
+        with self.assertRaises(AttributeError):
+            clone.width = 1
+
+
+if __name__ == "__main__":
+    unittest.main()